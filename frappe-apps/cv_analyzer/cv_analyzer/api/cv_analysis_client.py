@@ -5,10 +5,42 @@
 API Client for CV Analysis Microservice
 """
 
+import os
+
 import frappe
 import requests
-import base64
 from frappe import _
+from cv_analyzer.cv_analyzer.doctype.company_evaluation_criteria.company_evaluation_criteria import (
+	build_criteria_dict,
+)
+from cv_analyzer.cv_analyzer.doctype.position_evaluation_framework.position_evaluation_framework import (
+	FRAMEWORK_FIELDS,
+	build_framework_dict,
+)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _make_session():
+	"""Build a shared session with connection pooling and retries"""
+	session = requests.Session()
+	adapter = HTTPAdapter(
+		pool_connections=10,
+		pool_maxsize=20,
+		max_retries=Retry(
+			total=3,
+			backoff_factor=0.2,
+			status_forcelist=[502, 503, 504]
+		)
+	)
+	session.mount("http://", adapter)
+	session.mount("https://", adapter)
+	session.headers["User-Agent"] = "frappe-cv-analyzer"
+	return session
+
+
+# Shared session so all client instances reuse pooled keep-alive connections
+_SESSION = _make_session()
 
 
 class CVAnalysisClient:
@@ -16,7 +48,8 @@ class CVAnalysisClient:
 
 	def __init__(self):
 		"""Initialize client with settings"""
-		self.settings = frappe.get_single("CV Analysis Settings")
+		self.settings = frappe.get_cached_doc("CV Analysis Settings")
+		self.session = _SESSION
 
 	def check_health(self):
 		"""
@@ -27,7 +60,7 @@ class CVAnalysisClient:
 		"""
 		try:
 			url = self.settings.get_health_url()
-			response = requests.get(url, timeout=10)
+			response = self.session.get(url, timeout=(5, 10))
 			response.raise_for_status()
 			return response.json()
 		except requests.exceptions.RequestException as e:
@@ -51,38 +84,40 @@ class CVAnalysisClient:
 		Raises:
 			frappe.ValidationError: If analysis fails
 		"""
-		# Get CV file content
-		cv_base64 = self._get_cv_base64(cv_file_url)
-		if not cv_base64:
+		# Locate CV file on disk
+		cv_file_path = self._get_cv_file_path(cv_file_url)
+		if not cv_file_path:
 			frappe.throw(_("Could not read CV file"))
 
 		# Get evaluation frameworks
 		position_framework = self._get_position_framework(job_applicant_doc.job_title)
 		company_criteria = self._get_company_criteria()
 
-		# Build request payload
-		payload = {
-			"cv_file": cv_base64,
-			"cv_filename": self._get_filename_from_url(cv_file_url),
-			"position_framework": position_framework,
-			"company_criteria": company_criteria,
-			"config": {
-				"llm_provider": self.settings.default_llm_provider or "auto",
-				"prompt_version": self.settings.default_prompt_version or "v1",
-				"analysis_depth": "detailed"
-			}
+		# Build multipart form fields (file itself is streamed, not buffered)
+		form_data = {
+			"position_framework": frappe.as_json(position_framework),
+			"company_criteria": frappe.as_json(company_criteria),
+			"llm_provider": self.settings.default_llm_provider or "auto",
+			"prompt_version": self.settings.default_prompt_version or "v1",
+			"analysis_depth": "detailed"
 		}
 
 		# Call microservice
 		try:
-			url = self.settings.get_api_url()
+			url = self.settings.get_upload_url()
 			frappe.publish_realtime(
 				event="cv_analysis_progress",
 				message={"status": "started", "applicant": job_applicant_doc.name},
 				user=frappe.session.user
 			)
 
-			response = requests.post(url, json=payload, timeout=120)
+			with open(cv_file_path, "rb") as f:
+				response = self.session.post(
+					url,
+					files={"cv_file": (self._get_filename_from_url(cv_file_url), f, "application/pdf")},
+					data=form_data,
+					timeout=(5, 120)
+				)
 			response.raise_for_status()
 
 			result = response.json()
@@ -117,30 +152,24 @@ class CVAnalysisClient:
 			)
 			frappe.throw(_("CV analysis failed: {0}").format(error_msg))
 
-	def _get_cv_base64(self, file_url):
+	def _get_cv_file_path(self, file_url):
 		"""
-		Get base64 encoded CV file
+		Resolve the on-disk path of a CV file
 
 		Args:
 			file_url: Frappe file URL
 
 		Returns:
-			str: Base64 encoded file content
+			str: Absolute file path, or None if the file cannot be found
 		"""
 		try:
 			# Get file doc
 			file_doc = frappe.get_doc("File", {"file_url": file_url})
 
-			# Read file content
 			if file_doc.is_private:
-				file_path = frappe.get_site_path("private", "files", file_doc.file_name)
-			else:
-				file_path = frappe.get_site_path("public", "files", file_doc.file_name)
-
-			with open(file_path, "rb") as f:
-				content = f.read()
+				return frappe.get_site_path("private", "files", file_doc.file_name)
 
-			return base64.b64encode(content).decode()
+			return frappe.get_site_path("public", "files", file_doc.file_name)
 
 		except Exception as e:
 			frappe.log_error(
@@ -154,9 +183,8 @@ class CVAnalysisClient:
 		if not file_url:
 			return "cv.pdf"
 
-		# Get filename from URL
-		parts = file_url.split('/')
-		return parts[-1] if parts else "cv.pdf"
+		# Get filename from URL (C-level basename, no intermediate list)
+		return os.path.basename(file_url) or "cv.pdf"
 
 	def _get_position_framework(self, job_title):
 		"""
@@ -184,14 +212,18 @@ class CVAnalysisClient:
 				"experience_years_required": 0
 			}
 
-		# Try to find position framework
-		if frappe.db.exists("Position Evaluation Framework", job_title):
-			framework_doc = frappe.get_doc("Position Evaluation Framework", job_title)
-			return framework_doc.get_framework_dict()
+		# Try to find position framework (single field-scoped query, no hydration)
+		framework = frappe.db.get_value(
+			"Position Evaluation Framework", job_title, FRAMEWORK_FIELDS, as_dict=True
+		)
+		if framework:
+			return build_framework_dict(framework)
 
 		# Fallback: create basic framework from job opening
-		if frappe.db.exists("Job Opening", job_title):
-			job_opening = frappe.get_doc("Job Opening", job_title)
+		job_opening = frappe.db.get_value(
+			"Job Opening", job_title, ["job_title", "description"], as_dict=True
+		)
+		if job_opening:
 			return {
 				"role_title": job_opening.job_title or job_title,
 				"key_requirements": [job_opening.description[:200]] if job_opening.description else [],
@@ -228,9 +260,10 @@ class CVAnalysisClient:
 		Returns:
 			dict: Company criteria
 		"""
-		if frappe.db.exists("Company Evaluation Criteria", "Company Evaluation Criteria"):
-			criteria_doc = frappe.get_single("Company Evaluation Criteria")
-			return criteria_doc.get_criteria_dict()
+		# Single query against tabSingles instead of exists + get_single
+		criteria = frappe.db.get_singles_dict("Company Evaluation Criteria")
+		if criteria:
+			return build_criteria_dict(criteria)
 
 		# Default criteria
 		return {
@@ -8,6 +8,21 @@ Job Applicant hooks for CV Analysis
 import frappe
 from frappe import _
 from cv_analyzer.api.cv_analysis_client import get_client
+from cv_analyzer.cv_analyzer.doctype.cv_analysis_result.cv_analysis_result import CVAnalysisResult
+
+# Module-level template: compiled once by Jinja's template cache instead
+# of rebuilding the HTML with f-strings on every notification
+ANALYSIS_EMAIL_TEMPLATE = """
+<h3>CV Analysis Results</h3>
+<p><strong>Applicant:</strong> {{ applicant_name }}</p>
+<p><strong>Position:</strong> {{ job_title or 'N/A' }}</p>
+<p><strong>Overall Score:</strong> {{ overall_score }}/100</p>
+<p><strong>Recommendation:</strong> {{ recommendation }}</p>
+
+<p><a href="{{ site_url }}/app/cv-analysis-result/{{ analysis_name }}">
+	View Full Analysis
+</a></p>
+"""
 
 
 def on_job_applicant_save(doc, method=None):
@@ -19,31 +34,22 @@ def on_job_applicant_save(doc, method=None):
 		doc: Job Applicant document
 		method: Event method name
 	"""
-	# Check if auto-analysis is enabled
-	settings = frappe.get_single("CV Analysis Settings")
-	if not settings.auto_analyze_on_cv_upload:
-		return
-
-	# Check if resume attachment has changed
+	# Cheap document-local checks first: no resume, nothing to analyze
 	if not doc.resume_attachment:
 		return
 
 	# Check if this is a new upload or update
-	if method == "on_update":
-		# Get the old doc to check if resume changed
-		old_doc = doc.get_doc_before_save()
-		if old_doc and old_doc.resume_attachment == doc.resume_attachment:
-			# Resume hasn't changed, skip analysis
-			return
+	if method == "on_update" and not doc.has_value_changed("resume_attachment"):
+		# Resume hasn't changed, skip analysis
+		return
+
+	# Check if auto-analysis is enabled
+	settings = frappe.get_cached_doc("CV Analysis Settings")
+	if not settings.auto_analyze_on_cv_upload:
+		return
 
 	# Trigger CV analysis in background
-	frappe.enqueue(
-		analyze_cv_async,
-		queue="long",
-		timeout=300,
-		job_applicant=doc.name,
-		cv_file_url=doc.resume_attachment
-	)
+	enqueue_cv_analysis(doc.name, doc.resume_attachment)
 
 	frappe.msgprint(
 		_("CV analysis has been queued. You will be notified when it's complete."),
@@ -52,6 +58,25 @@ def on_job_applicant_save(doc, method=None):
 	)
 
 
+def enqueue_cv_analysis(job_applicant, cv_file_url):
+	"""
+	Queue CV analysis, deduplicating concurrent requests for the same CV
+
+	Args:
+		job_applicant: Job Applicant docname
+		cv_file_url: URL to CV file
+	"""
+	frappe.enqueue(
+		analyze_cv_async,
+		queue="long",
+		timeout=300,
+		job_id=f"cv_analysis::{job_applicant}::{cv_file_url}",
+		deduplicate=True,
+		job_applicant=job_applicant,
+		cv_file_url=cv_file_url
+	)
+
+
 def analyze_cv_async(job_applicant, cv_file_url):
 	"""
 	Analyze CV in background
@@ -69,10 +94,11 @@ def analyze_cv_async(job_applicant, cv_file_url):
 		result = client.analyze_cv(doc, cv_file_url)
 
 		# Save analysis result
-		from cv_analyzer.cv_analyzer.doctype.cv_analysis_result.cv_analysis_result import CVAnalysisResult
 		analysis_doc = CVAnalysisResult.create_from_api_response(job_applicant, result)
 
-		# Notify user
+		# Notify user; after_commit batches the publish into the commit
+		# flush so it rides the same Redis round-trip as other queued
+		# messages and never fires for a rolled-back result
 		frappe.publish_realtime(
 			event="cv_analysis_complete",
 			message={
@@ -81,7 +107,8 @@ def analyze_cv_async(job_applicant, cv_file_url):
 				"score": analysis_doc.overall_score,
 				"recommendation": analysis_doc.recommendation
 			},
-			user=doc.owner
+			user=doc.owner,
+			after_commit=True
 		)
 
 		# Send email notification (optional)
@@ -115,34 +142,32 @@ def send_analysis_notification(job_applicant_doc, analysis_doc):
 		analysis_doc: CV Analysis Result document
 	"""
 	try:
-		# Get recipients (owner and HR managers)
-		recipients = [job_applicant_doc.owner]
-
-		# Add HR Managers
-		hr_managers = frappe.get_all(
-			"Has Role",
-			filters={"role": "HR Manager", "parenttype": "User"},
-			fields=["parent"]
+		# Get recipients (owner and enabled HR managers) in a single JOIN
+		hr_managers = frappe.db.sql_list(
+			"""
+			SELECT DISTINCT hr.parent
+			FROM `tabHas Role` hr
+			INNER JOIN `tabUser` u ON u.name = hr.parent
+			WHERE hr.role = 'HR Manager'
+				AND hr.parenttype = 'User'
+				AND u.enabled = 1
+			"""
 		)
-		recipients.extend([r.parent for r in hr_managers])
 
 		# Remove duplicates
-		recipients = list(set(recipients))
+		recipients = list(set([job_applicant_doc.owner] + hr_managers))
 
 		# Prepare email content
 		subject = f"CV Analysis Complete: {job_applicant_doc.applicant_name}"
 
-		message = f"""
-		<h3>CV Analysis Results</h3>
-		<p><strong>Applicant:</strong> {job_applicant_doc.applicant_name}</p>
-		<p><strong>Position:</strong> {job_applicant_doc.job_title or 'N/A'}</p>
-		<p><strong>Overall Score:</strong> {analysis_doc.overall_score}/100</p>
-		<p><strong>Recommendation:</strong> {analysis_doc.recommendation}</p>
-
-		<p><a href="{frappe.utils.get_url()}/app/cv-analysis-result/{analysis_doc.name}">
-			View Full Analysis
-		</a></p>
-		"""
+		message = frappe.render_template(ANALYSIS_EMAIL_TEMPLATE, {
+			"applicant_name": job_applicant_doc.applicant_name,
+			"job_title": job_applicant_doc.job_title,
+			"overall_score": analysis_doc.overall_score,
+			"recommendation": analysis_doc.recommendation,
+			"site_url": frappe.utils.get_url(),
+			"analysis_name": analysis_doc.name
+		})
 
 		# Send email
 		frappe.sendmail(
@@ -177,13 +202,7 @@ def trigger_manual_analysis(job_applicant):
 		frappe.throw(_("No resume attachment found"))
 
 	# Trigger analysis
-	frappe.enqueue(
-		analyze_cv_async,
-		queue="long",
-		timeout=300,
-		job_applicant=doc.name,
-		cv_file_url=doc.resume_attachment
-	)
+	enqueue_cv_analysis(doc.name, doc.resume_attachment)
 
 	return {
 		"message": _("CV analysis has been queued"),
@@ -205,12 +224,13 @@ def get_latest_analysis(job_applicant):
 	analyses = frappe.get_all(
 		"CV Analysis Result",
 		filters={"job_applicant": job_applicant},
-		fields=["name", "overall_score", "recommendation", "analysis_date"],
+		fields=[
+			"name", "job_applicant", "analysis_id", "analysis_date",
+			"overall_score", "recommendation", "llm_provider",
+			"tokens_used", "processing_time_ms"
+		],
 		order_by="analysis_date desc",
 		limit=1
 	)
 
-	if analyses:
-		return frappe.get_doc("CV Analysis Result", analyses[0].name).as_dict()
-
-	return None
+	return analyses[0] if analyses else None
@@ -9,11 +9,26 @@ class CompanyEvaluationCriteria(Document):
 	"""Company Evaluation Criteria DocType"""
 
 	def get_criteria_dict(self):
-		"""Convert criteria to dictionary format for API"""
-		return {
-			"company_name": self.company_name or "",
-			"values": [v.strip() for v in (self.company_values or "").split('\n') if v.strip()],
-			"evaluation_guidelines": self.evaluation_guidelines or "",
-			"disqualifiers": [d.strip() for d in (self.disqualifiers or "").split('\n') if d.strip()],
-			"preferred_backgrounds": [p.strip() for p in (self.preferred_backgrounds or "").split('\n') if p.strip()]
-		}
+		"""Convert criteria to dictionary format for API (cached per instance)"""
+		if not self.get("_criteria_dict"):
+			self._criteria_dict = build_criteria_dict(self)
+		return self._criteria_dict
+
+
+def build_criteria_dict(data):
+	"""
+	Build the API criteria dict from a Document or field dict
+
+	Args:
+		data: Company Evaluation Criteria document or dict of its fields
+
+	Returns:
+		dict: Company criteria in API format
+	"""
+	return {
+		"company_name": data.get("company_name") or "",
+		"values": [v.strip() for v in (data.get("company_values") or "").split('\n') if v.strip()],
+		"evaluation_guidelines": data.get("evaluation_guidelines") or "",
+		"disqualifiers": [d.strip() for d in (data.get("disqualifiers") or "").split('\n') if d.strip()],
+		"preferred_backgrounds": [p.strip() for p in (data.get("preferred_backgrounds") or "").split('\n') if p.strip()]
+	}
@@ -25,47 +25,44 @@ class CVAnalysisResult(Document):
 		Returns:
 			CV Analysis Result document
 		"""
-		doc = frappe.get_doc({
-			"doctype": "CV Analysis Result",
-			"job_applicant": job_applicant,
-			"analysis_id": api_response.get("analysis_id"),
-			"overall_score": api_response.get("overall_score"),
-			"recommendation": api_response.get("recommendation"),
-			"llm_provider": api_response.get("metadata", {}).get("llm_provider"),
-			"tokens_used": api_response.get("metadata", {}).get("tokens_used"),
-			"processing_time_ms": api_response.get("metadata", {}).get("processing_time_ms")
-		})
-
-		# Add section scores
-		for section in api_response.get("section_scores", []):
-			doc.append("section_scores", {
+		# Build section scores
+		section_scores = [
+			{
 				"section": section.get("section"),
 				"score": section.get("score"),
 				"weight": section.get("weight"),
 				"weighted_score": section.get("weighted_score"),
 				"rationale": section.get("rationale")
-			})
+			}
+			for section in api_response.get("section_scores", [])
+		]
 
-		# Add strengths
-		for strength in api_response.get("key_strengths", []):
-			doc.append("insights", {
-				"insight_type": "Strength",
-				"description": strength
-			})
+		# Build insights (strengths, gaps, follow-up questions)
+		insights = [
+			{"insight_type": insight_type, "description": description}
+			for insight_type, field in (
+				("Strength", "key_strengths"),
+				("Gap", "critical_gaps"),
+				("Follow-up Question", "follow_up_questions")
+			)
+			for description in api_response.get(field, [])
+		]
 
-		# Add gaps
-		for gap in api_response.get("critical_gaps", []):
-			doc.append("insights", {
-				"insight_type": "Gap",
-				"description": gap
-			})
+		metadata = api_response.get("metadata", {})
 
-		# Add follow-up questions
-		for question in api_response.get("follow_up_questions", []):
-			doc.append("insights", {
-				"insight_type": "Follow-up Question",
-				"description": question
-			})
+		# Single fully-populated document, one insert for parent + children
+		doc = frappe.get_doc({
+			"doctype": "CV Analysis Result",
+			"job_applicant": job_applicant,
+			"analysis_id": api_response.get("analysis_id"),
+			"overall_score": api_response.get("overall_score"),
+			"recommendation": api_response.get("recommendation"),
+			"llm_provider": metadata.get("llm_provider"),
+			"tokens_used": metadata.get("tokens_used"),
+			"processing_time_ms": metadata.get("processing_time_ms"),
+			"section_scores": section_scores,
+			"insights": insights
+		})
 
 		doc.insert(ignore_permissions=True)
 		return doc
@@ -14,10 +14,18 @@ class CVAnalysisSettings(Document):
 		if self.service_url and self.service_url.endswith('/'):
 			self.service_url = self.service_url.rstrip('/')
 
+	def on_update(self):
+		"""Invalidate the cached singleton so readers see fresh settings"""
+		frappe.clear_document_cache(self.doctype, self.doctype)
+
 	def get_api_url(self):
 		"""Get the full API URL for CV analysis"""
 		return f"{self.service_url}/api/{self.api_version}/analyze"
 
+	def get_upload_url(self):
+		"""Get the full API URL for multipart CV analysis"""
+		return f"{self.service_url}/api/{self.api_version}/analyze-upload"
+
 	def get_health_url(self):
 		"""Get the health check URL"""
 		return f"{self.service_url}/api/{self.api_version}/health"
@@ -3,6 +3,7 @@
 
 import frappe
 from frappe.model.document import Document
+from frappe.utils import cint
 
 
 class PositionEvaluationFramework(Document):
@@ -11,12 +12,13 @@ class PositionEvaluationFramework(Document):
 	def validate(self):
 		"""Validate that weights add up to 100"""
 		total_weight = (
-			(self.technical_skills_weight or 0) +
-			(self.experience_weight or 0) +
-			(self.education_weight or 0) +
-			(self.cultural_fit_weight or 0)
+			cint(self.technical_skills_weight) +
+			cint(self.experience_weight) +
+			cint(self.education_weight) +
+			cint(self.cultural_fit_weight)
 		)
 
+		# Build the warning string only on the failure path
 		if total_weight != 100:
 			frappe.msgprint(
 				f"Warning: Scoring weights should add up to 100%. Current total: {total_weight}%",
@@ -24,17 +26,46 @@ class PositionEvaluationFramework(Document):
 			)
 
 	def get_framework_dict(self):
-		"""Convert framework to dictionary format for API"""
-		return {
-			"role_title": self.role_title or "",
-			"key_requirements": [r.strip() for r in (self.key_requirements or "").split('\n') if r.strip()],
-			"scoring_weights": {
-				"technical_skills": self.technical_skills_weight or 40,
-				"experience": self.experience_weight or 30,
-				"education": self.education_weight or 15,
-				"cultural_fit": self.cultural_fit_weight or 15
-			},
-			"must_have_skills": [s.strip() for s in (self.must_have_skills or "").split('\n') if s.strip()],
-			"nice_to_have_skills": [s.strip() for s in (self.nice_to_have_skills or "").split('\n') if s.strip()],
-			"experience_years_required": self.experience_years_required or 0
-		}
+		"""Convert framework to dictionary format for API (cached per instance)"""
+		if not self.get("_framework_dict"):
+			self._framework_dict = build_framework_dict(self)
+		return self._framework_dict
+
+
+# Fields needed to build the API framework dict without full Document hydration
+FRAMEWORK_FIELDS = [
+	"role_title",
+	"key_requirements",
+	"technical_skills_weight",
+	"experience_weight",
+	"education_weight",
+	"cultural_fit_weight",
+	"must_have_skills",
+	"nice_to_have_skills",
+	"experience_years_required"
+]
+
+
+def build_framework_dict(data):
+	"""
+	Build the API framework dict from a Document or field dict
+
+	Args:
+		data: Position Evaluation Framework document or dict of its fields
+
+	Returns:
+		dict: Position framework in API format
+	"""
+	return {
+		"role_title": data.get("role_title") or "",
+		"key_requirements": [r.strip() for r in (data.get("key_requirements") or "").split('\n') if r.strip()],
+		"scoring_weights": {
+			"technical_skills": data.get("technical_skills_weight") or 40,
+			"experience": data.get("experience_weight") or 30,
+			"education": data.get("education_weight") or 15,
+			"cultural_fit": data.get("cultural_fit_weight") or 15
+		},
+		"must_have_skills": [s.strip() for s in (data.get("must_have_skills") or "").split('\n') if s.strip()],
+		"nice_to_have_skills": [s.strip() for s in (data.get("nice_to_have_skills") or "").split('\n') if s.strip()],
+		"experience_years_required": data.get("experience_years_required") or 0
+	}
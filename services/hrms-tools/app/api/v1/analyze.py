@@ -1,14 +1,20 @@
 """
 CV Analysis API Endpoints
 """
+import asyncio
+import contextlib
 import logging
-import json
-import base64
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, status, UploadFile, File, Form
 from fastapi.responses import JSONResponse
-from typing import Optional
-
-from app.models.request import CVAnalysisRequest
+from pydantic import ValidationError
+from typing import List, Optional
+
+from app.models.request import (
+    ALLOWED_CV_EXTENSIONS,
+    CVAnalysisRequest,
+    CompanyCriteria,
+    PositionFramework
+)
 from app.models.response import CVAnalysisResponse, ErrorResponse, HealthResponse
 from app.services.cv_analyzer import get_cv_analyzer, CVAnalyzerError
 from app.core.config import get_settings
@@ -18,6 +24,178 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Chunk size for bounded upload reads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# How often the disconnect watcher re-polls the client connection
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+async def watch_disconnect(http_request: Request) -> None:
+    """
+    Complete only once the client has actually gone away
+
+    Request.is_disconnected() is a non-blocking poll that reports the
+    current connection state immediately, so it has to be re-checked on
+    an interval: awaiting it once would complete on the first check with
+    False and look like a disconnect to the race in run_with_deadline.
+
+    Args:
+        http_request: The incoming request to watch
+    """
+    while not await http_request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+async def read_upload_limited(cv_file: UploadFile, max_bytes: int) -> bytes:
+    """
+    Read an upload in bounded chunks, rejecting oversize files early
+
+    Args:
+        cv_file: The uploaded file
+        max_bytes: Maximum allowed size in bytes
+
+    Returns:
+        File content
+
+    Raises:
+        HTTPException: 413 as soon as the running total exceeds max_bytes
+    """
+    chunks = []
+    total = 0
+    while True:
+        chunk = await cv_file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail={
+                    "error": "ValidationError",
+                    "message": f"File exceeds maximum size of {max_bytes // (1024 * 1024)}MB"
+                }
+            )
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+async def run_with_deadline(analysis_coro, http_request: Request):
+    """
+    Run an analysis coroutine with a deadline and disconnect watching
+
+    Without this, a client that times out or goes away leaves the LLM call
+    running, burning a semaphore slot and provider tokens for a response
+    nobody will read.
+
+    Args:
+        analysis_coro: The analyzer.analyze(...) coroutine
+        http_request: The incoming request, polled for disconnects
+
+    Returns:
+        The analysis response
+
+    Raises:
+        HTTPException: 504 if the deadline passes before the analysis ends
+    """
+    analysis_task = asyncio.ensure_future(analysis_coro)
+    disconnect_task = asyncio.ensure_future(watch_disconnect(http_request))
+
+    try:
+        done, _ = await asyncio.wait(
+            {analysis_task, disconnect_task},
+            timeout=get_settings().REQUEST_TIMEOUT_SECONDS,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+
+        if analysis_task in done:
+            return analysis_task.result()
+
+        if disconnect_task in done:
+            logger.info("Client disconnected, cancelling in-flight analysis")
+            # 499 (client closed request) is never delivered; it only keeps
+            # the access log honest
+            return JSONResponse(status_code=499, content=None)
+
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail={
+                "error": "TimeoutError",
+                "message": "Analysis did not complete within the request timeout"
+            }
+        )
+
+    finally:
+        for task in (analysis_task, disconnect_task):
+            if not task.done():
+                task.cancel()
+
+
+@contextlib.asynccontextmanager
+async def _translate_errors():
+    """
+    Map analysis failures onto HTTP errors in one place
+
+    Both analyze endpoints used to carry an identical except ladder; this
+    keeps the mapping in a single spot so the routes only differ in how
+    they assemble the request.
+    """
+    try:
+        yield
+    except HTTPException:
+        raise
+    except CVAnalyzerError as e:
+        logger.error("Analysis error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "AnalysisError",
+                "message": str(e)
+            }
+        )
+    except Exception as e:
+        # Full tracebacks only in debug; in production the repr is enough
+        # and skips the traceback walk on every failure
+        logger.error("Unexpected error: %r", e, exc_info=get_settings().DEBUG)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "InternalServerError",
+                "message": "An unexpected error occurred during analysis"
+            }
+        )
+
+
+async def _run_analysis(
+    request: CVAnalysisRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks,
+    cv_bytes: Optional[bytes] = None
+) -> CVAnalysisResponse:
+    """
+    Shared analyze pipeline behind both endpoints
+
+    Args:
+        request: Assembled analysis request
+        http_request: Incoming request, watched for disconnects
+        background_tasks: Deferred-work handle for audit logging
+        cv_bytes: Raw CV content from a multipart upload, if any
+
+    Returns:
+        The analysis response
+    """
+    async with _translate_errors():
+        analyzer = get_cv_analyzer()
+        return await run_with_deadline(
+            analyzer.analyze(
+                request,
+                background_tasks=background_tasks,
+                cv_bytes=cv_bytes
+            ),
+            http_request
+        )
+
 
 @router.post(
     "/analyze",
@@ -31,7 +209,7 @@ router = APIRouter()
         500: {"description": "Internal server error", "model": ErrorResponse}
     }
 )
-async def analyze_cv(request: CVAnalysisRequest):
+async def analyze_cv(request: CVAnalysisRequest, background_tasks: BackgroundTasks, http_request: Request):
     """
     Analyze a CV and return structured evaluation results
 
@@ -51,34 +229,11 @@ async def analyze_cv(request: CVAnalysisRequest):
     **Response:**
     - Structured analysis with scores, recommendations, and insights
     """
-    try:
-        logger.info(f"Received analysis request for: {request.cv_filename}")
+    logger.info("Received analysis request for: %s", request.cv_filename)
 
-        # Get analyzer and perform analysis
-        analyzer = get_cv_analyzer()
-        response = await analyzer.analyze(request)
-
-        return response
-
-    except CVAnalyzerError as e:
-        logger.error(f"Analysis error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "AnalysisError",
-                "message": str(e)
-            }
-        )
-
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "error": "InternalServerError",
-                "message": "An unexpected error occurred during analysis"
-            }
-        )
+    # Audit logging is deferred to a background task so it does not delay
+    # the response
+    return await _run_analysis(request, http_request, background_tasks)
 
 
 @router.post(
@@ -94,6 +249,8 @@ async def analyze_cv(request: CVAnalysisRequest):
     }
 )
 async def analyze_cv_upload(
+    background_tasks: BackgroundTasks,
+    http_request: Request,
     cv_file: UploadFile = File(..., description="CV file (PDF or DOCX)"),
     position_framework: str = Form(..., description="JSON string of position framework"),
     company_criteria: str = Form(..., description="JSON string of company criteria"),
@@ -126,8 +283,8 @@ async def analyze_cv_upload(
       -F "llm_provider=auto"
     ```
     """
-    try:
-        logger.info(f"Received upload analysis request for: {cv_file.filename}")
+    async with _translate_errors():
+        logger.info("Received upload analysis request for: %s", cv_file.filename)
 
         # Validate file type
         if not cv_file.filename:
@@ -136,25 +293,31 @@ async def analyze_cv_upload(
                 detail={"error": "ValidationError", "message": "Filename is required"}
             )
 
-        allowed_extensions = ['.pdf', '.doc', '.docx']
-        if not any(cv_file.filename.lower().endswith(ext) for ext in allowed_extensions):
+        dot = cv_file.filename.rfind('.')
+        ext = cv_file.filename[dot:].lower() if dot >= 0 else ''
+        if ext not in ALLOWED_CV_EXTENSIONS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
                     "error": "ValidationError",
-                    "message": f"File must be one of: {', '.join(allowed_extensions)}"
+                    "message": f"File must be one of: {', '.join(sorted(ALLOWED_CV_EXTENSIONS))}"
                 }
             )
 
-        # Read file content and encode to base64 (for internal processing)
-        file_content = await cv_file.read()
-        cv_base64 = base64.b64encode(file_content).decode()
+        # Read file content in bounded chunks (oversize uploads are
+        # rejected mid-stream); bytes are passed straight to the
+        # analyzer, no base64 round-trip
+        settings = get_settings()
+        file_content = await read_upload_limited(
+            cv_file, settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        )
 
-        # Parse JSON strings
+        # Validate form fields straight from their JSON bytes: one pass
+        # through pydantic's Rust parser, no intermediate dicts
         try:
-            position_framework_dict = json.loads(position_framework)
-            company_criteria_dict = json.loads(company_criteria)
-        except json.JSONDecodeError as e:
+            framework = PositionFramework.model_validate_json(position_framework)
+            criteria = CompanyCriteria.model_validate_json(company_criteria)
+        except ValidationError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -163,12 +326,12 @@ async def analyze_cv_upload(
                 }
             )
 
-        # Build request object
+        # Build request object (cv_file stays empty; raw bytes ride alongside)
         request = CVAnalysisRequest(
-            cv_file=cv_base64,
+            cv_file="",
             cv_filename=cv_file.filename,
-            position_framework=position_framework_dict,
-            company_criteria=company_criteria_dict,
+            position_framework=framework,
+            company_criteria=criteria,
             config={
                 "llm_provider": llm_provider,
                 "prompt_version": prompt_version,
@@ -176,35 +339,73 @@ async def analyze_cv_upload(
             }
         )
 
-        # Perform analysis
-        analyzer = get_cv_analyzer()
-        response = await analyzer.analyze(request)
+        # Perform analysis; audit logging is deferred to a background task
+        return await _run_analysis(
+            request, http_request, background_tasks, cv_bytes=file_content
+        )
 
-        return response
 
-    except CVAnalyzerError as e:
-        logger.error(f"Analysis error: {e}")
+# Upper bound on CVs per batch request
+MAX_BATCH_SIZE = 20
+
+
+@router.post(
+    "/analyze-batch",
+    status_code=status.HTTP_200_OK,
+    summary="Analyze multiple CVs",
+    description="Analyze a batch of CVs concurrently in a single request",
+    responses={
+        200: {"description": "Batch processed; per-item status in the response list"},
+        400: {"description": "Invalid request", "model": ErrorResponse}
+    }
+)
+async def analyze_cv_batch(requests: List[CVAnalysisRequest]):
+    """
+    Analyze multiple candidate CVs in one round-trip
+
+    The batch is dispatched with asyncio.gather, so analyses overlap their
+    LLM latency; overall provider concurrency stays bounded by the
+    analyzer's semaphore. Each item succeeds or fails independently.
+
+    **Response:** list of objects in request order, each either a full
+    analysis result or `{"error", "message", "cv_filename"}`.
+    """
+    if not requests:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "AnalysisError",
-                "message": str(e)
-            }
+            detail={"error": "ValidationError", "message": "Batch must not be empty"}
         )
 
-    except HTTPException:
-        raise  # Re-raise HTTPException as-is
-
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
+    if len(requests) > MAX_BATCH_SIZE:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail={
-                "error": "InternalServerError",
-                "message": "An unexpected error occurred during analysis"
+                "error": "ValidationError",
+                "message": f"Batch size exceeds maximum of {MAX_BATCH_SIZE}"
             }
         )
 
+    logger.info("Received batch analysis request with %d CVs", len(requests))
+
+    analyzer = get_cv_analyzer()
+    results = await asyncio.gather(
+        *(analyzer.analyze(request) for request in requests),
+        return_exceptions=True
+    )
+
+    response = []
+    for request, result in zip(requests, results):
+        if isinstance(result, Exception):
+            response.append({
+                "error": "AnalysisError",
+                "message": str(result),
+                "cv_filename": request.cv_filename
+            })
+        else:
+            response.append(result)
+
+    return response
+
 
 @router.get(
     "/health",
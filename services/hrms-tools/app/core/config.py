@@ -1,6 +1,8 @@
 """
 Core configuration for CV Analysis Service
 """
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
@@ -16,8 +18,14 @@ class Settings(BaseSettings):
 
     # API Configuration
     API_V1_PREFIX: str = "/api/v1"
+    # Explicit browser origins allowed by CORS; empty means wildcard
+    # (and therefore no credentials)
+    CORS_ORIGINS: tuple = ()
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    # Worker processes for the dev runner; containers size this via
+    # WEB_CONCURRENCY, which uvicorn reads natively
+    WORKERS: int = 1
 
     # LLM Provider Configuration
     DEFAULT_LLM_PROVIDER: str = "openai"  # openai, anthropic, gemini, auto
@@ -46,7 +54,24 @@ class Settings(BaseSettings):
 
     # Document Processing
     MAX_FILE_SIZE_MB: int = 10
-    ALLOWED_EXTENSIONS: list = [".pdf", ".doc", ".docx"]
+    ALLOWED_EXTENSIONS: tuple = (".pdf", ".doc", ".docx")
+
+    # Analysis response cache (skips duplicate LLM calls)
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 256
+    ANALYSIS_CACHE_TTL_SECONDS: int = 3600
+
+    # Concurrency
+    MAX_CONCURRENT_LLM_CALLS: int = 8
+    LLM_REQUESTS_PER_MINUTE: int = 60
+
+    # Hedged requests for 'auto' provider selection: race providers and
+    # take the first success. Off by default because the loser's tokens
+    # are still billed whenever the stagger overlaps
+    HEDGED_AUTO_REQUESTS: bool = False
+    HEDGE_STAGGER_SECONDS: float = 0.5
+
+    # How often the background task re-probes provider availability
+    PROVIDER_REFRESH_INTERVAL_SECONDS: int = 60
 
     # Request Limits
     MAX_RETRIES: int = 3
@@ -56,12 +81,12 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = True
+        # Settings are read-only after startup; freezing skips pydantic's
+        # mutation machinery and makes accidental runtime writes an error
+        frozen = True
 
 
-# Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=None)
 def get_settings() -> Settings:
-    """Get application settings"""
-    return settings
+    """Get the application settings singleton"""
+    return Settings()
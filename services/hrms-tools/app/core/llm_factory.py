@@ -2,10 +2,14 @@
 LLM Provider Factory
 Handles selection and instantiation of LLM providers
 """
+import asyncio
+from functools import lru_cache
 from typing import Optional
 import logging
+import httpx
 from app.core.config import get_settings
 from app.llm_providers.base import BaseLLMProvider, LLMProviderError
+from app.llm_providers.limiter import AsyncTokenBucket
 from app.llm_providers.openai_provider import OpenAIProvider
 from app.llm_providers.anthropic_provider import AnthropicProvider
 from app.llm_providers.gemini_provider import GeminiProvider
@@ -19,7 +23,52 @@ class LLMFactory:
     def __init__(self):
         self.settings = get_settings()
         self._providers = {}
+        # One pooled HTTP client shared by the OpenAI and Anthropic SDKs
+        # (both are httpx-based); keep-alive connections survive across
+        # requests instead of each call re-handshaking. HTTP/2 multiplexes
+        # concurrent calls over a single TLS connection per host
+        self._http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=300
+            ),
+            timeout=self.settings.REQUEST_TIMEOUT_SECONDS
+        )
         self._initialize_providers()
+        # Availability only depends on construction-time state, so compute
+        # it once instead of per health check / per request; auto-selection
+        # order is likewise fixed at init
+        self._auto_order = tuple(self._providers.keys())
+        self._availability = {
+            name: provider.is_available()
+            for name, provider in self._providers.items()
+        }
+        # Per-provider request-rate buckets; each provider has its own
+        # RPM budget, so throttling one must not stall the others
+        self._rate_limiters = {
+            name: AsyncTokenBucket(self.settings.LLM_REQUESTS_PER_MINUTE)
+            for name in self._providers
+        }
+
+    async def acquire_rate_limit(self, provider_name: str):
+        """Wait for the provider's token bucket before an API call"""
+        limiter = self._rate_limiters.get(provider_name)
+        if limiter is not None:
+            await limiter.acquire()
+
+    def refresh_availability(self):
+        """
+        Re-probe every provider's availability
+
+        Called periodically from a background task so the request path can
+        rely on the cached snapshot without it going permanently stale.
+        """
+        self._availability = {
+            name: provider.is_available()
+            for name, provider in self._providers.items()
+        }
 
     def _initialize_providers(self):
         """Initialize all available providers based on configuration"""
@@ -31,7 +80,8 @@ class LLMFactory:
                     api_key=self.settings.OPENAI_API_KEY,
                     model=self.settings.OPENAI_MODEL,
                     temperature=self.settings.OPENAI_TEMPERATURE,
-                    max_tokens=self.settings.OPENAI_MAX_TOKENS
+                    max_tokens=self.settings.OPENAI_MAX_TOKENS,
+                    http_client=self._http_client
                 )
                 logger.info("OpenAI provider initialized")
             except Exception as e:
@@ -44,7 +94,8 @@ class LLMFactory:
                     api_key=self.settings.ANTHROPIC_API_KEY,
                     model=self.settings.ANTHROPIC_MODEL,
                     temperature=self.settings.ANTHROPIC_TEMPERATURE,
-                    max_tokens=self.settings.ANTHROPIC_MAX_TOKENS
+                    max_tokens=self.settings.ANTHROPIC_MAX_TOKENS,
+                    http_client=self._http_client
                 )
                 logger.info("Anthropic provider initialized")
             except Exception as e:
@@ -86,36 +137,93 @@ class LLMFactory:
 
         # If still 'auto', pick first available
         if provider_name == 'auto':
-            if not self._providers:
+            if not self._auto_order:
                 raise LLMProviderError(
                     provider="auto",
                     message="No LLM providers are configured. Please set API keys in environment variables."
                 )
 
             # Return first available provider
-            provider_name = next(iter(self._providers.keys()))
-            logger.info(f"Auto-selected provider: {provider_name}")
+            provider_name = self._auto_order[0]
 
         # Get specific provider
-        if provider_name not in self._providers:
-            available = list(self._providers.keys())
+        provider = self._providers.get(provider_name)
+        if provider is None:
             raise LLMProviderError(
                 provider=provider_name,
-                message=f"Provider '{provider_name}' not available. Available providers: {available}"
+                message=f"Provider '{provider_name}' not available. Available providers: {list(self._auto_order)}"
             )
 
-        provider = self._providers[provider_name]
-
-        # Verify provider is available
-        if not provider.is_available():
+        # Check the cached availability snapshot instead of re-probing
+        # the provider on every request
+        if not self._availability.get(provider_name):
             raise LLMProviderError(
                 provider=provider_name,
                 message=f"Provider '{provider_name}' is not properly configured"
             )
 
-        logger.info(f"Using LLM provider: {provider_name}")
         return provider
 
+    async def generate_hedged(self, prompt: str, system_prompt: Optional[str] = None):
+        """
+        Race the available providers and take the first success
+
+        Secondary providers start after a stagger so the common case (a
+        healthy primary) rarely double-bills; when the primary is slow or
+        failing, the hedge hides it.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+
+        Returns:
+            Tuple of (LLMResponse, provider name that produced it)
+
+        Raises:
+            LLMProviderError: If every hedged provider fails
+        """
+        candidates = [
+            name for name in self._auto_order if self._availability.get(name)
+        ]
+        if not candidates:
+            raise LLMProviderError(
+                provider="auto",
+                message="No LLM providers are configured. Please set API keys in environment variables."
+            )
+
+        async def call_provider(name: str, delay: float):
+            if delay:
+                await asyncio.sleep(delay)
+            await self.acquire_rate_limit(name)
+            response = await self._providers[name].generate(prompt, system_prompt)
+            return response, name
+
+        stagger = self.settings.HEDGE_STAGGER_SECONDS
+        pending = {
+            asyncio.create_task(call_provider(name, index * stagger))
+            for index, name in enumerate(candidates)
+        }
+        last_error = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise LLMProviderError(
+            provider="auto",
+            message=f"All hedged providers failed; last error: {last_error}",
+            original_error=last_error if isinstance(last_error, Exception) else None
+        )
+
     def get_available_providers(self) -> dict:
         """
         Get status of all providers
@@ -124,24 +232,11 @@ class LLMFactory:
             Dict mapping provider names to availability status
         """
         status = {}
-
-        # Check OpenAI
-        if 'openai' in self._providers:
-            status['openai'] = 'available' if self._providers['openai'].is_available() else 'configured_but_unavailable'
-        else:
-            status['openai'] = 'not_configured'
-
-        # Check Anthropic
-        if 'anthropic' in self._providers:
-            status['anthropic'] = 'available' if self._providers['anthropic'].is_available() else 'configured_but_unavailable'
-        else:
-            status['anthropic'] = 'not_configured'
-
-        # Check Gemini
-        if 'gemini' in self._providers:
-            status['gemini'] = 'available' if self._providers['gemini'].is_available() else 'configured_but_unavailable'
-        else:
-            status['gemini'] = 'not_configured'
+        for name in ('openai', 'anthropic', 'gemini'):
+            if name in self._providers:
+                status[name] = 'available' if self._availability[name] else 'configured_but_unavailable'
+            else:
+                status[name] = 'not_configured'
 
         return status
 
@@ -150,13 +245,7 @@ class LLMFactory:
         return len(self._providers) > 0
 
 
-# Global factory instance
-_factory_instance: Optional[LLMFactory] = None
-
-
+@lru_cache(maxsize=None)
 def get_llm_factory() -> LLMFactory:
     """Get or create the global LLM factory instance"""
-    global _factory_instance
-    if _factory_instance is None:
-        _factory_instance = LLMFactory()
-    return _factory_instance
+    return LLMFactory()
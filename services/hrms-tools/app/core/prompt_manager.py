@@ -2,20 +2,141 @@
 Prompt Management System
 Handles versioned prompts for CV analysis
 """
+import json
 import os
 import logging
+from functools import lru_cache
 from typing import Dict, Optional
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
+# System prompt is fully static; one module-level constant shared by all
+# requests (also keeps it byte-identical for provider-side prompt caching)
+SYSTEM_PROMPT = """You are an expert HR analyst specializing in candidate evaluation.
+Your task is to analyze CVs objectively and provide structured, data-driven assessments.
+
+IMPORTANT: You must respond with valid JSON only. Do not include any text outside the JSON structure.
+
+The JSON response must have this exact structure:
+{
+  "overall_score": <number 0-100>,
+  "recommendation": "<strong_yes|yes|maybe|no|strong_no>",
+  "section_scores": [
+    {
+      "section": "<section name>",
+      "score": <number 0-100>,
+      "weight": <number 0-100>,
+      "weighted_score": <calculated: score * weight / 100>,
+      "rationale": "<detailed explanation>"
+    }
+  ],
+  "key_strengths": ["<strength 1>", "<strength 2>", ...],
+  "critical_gaps": ["<gap 1>", "<gap 2>", ...],
+  "follow_up_questions": ["<question 1>", "<question 2>", ...]
+}
+
+Be objective, thorough, and ensure all scores are justified with clear rationale."""
+
+# Pre-parsed user prompt skeleton; per-request values are slotted in with
+# a single format() call instead of rebuilding the template each time
+USER_PROMPT_TEMPLATE = """Analyze the following CV against the position requirements and company criteria.
+
+=== POSITION INFORMATION ===
+Role: {role_title}
+
+Key Requirements:
+{requirements_text}
+
+Must-Have Skills: {must_have}
+Nice-to-Have Skills: {nice_to_have}
+
+Scoring Weights:
+{weights_text}
+
+=== COMPANY CRITERIA ===
+Company: {company_name}
+Core Values: {values_text}
+
+Evaluation Guidelines:
+{evaluation_guidelines}
+
+Disqualifiers:
+{disqualifiers}
+
+=== CANDIDATE CV ===
+{cv_text}
+
+=== ANALYSIS INSTRUCTIONS ===
+1. Evaluate the candidate across all scoring dimensions (Technical Skills, Experience, Education, Cultural Fit)
+2. Calculate weighted scores based on the provided weights
+3. Identify 3-5 key strengths with specific evidence from the CV
+4. Identify 2-4 critical gaps or concerns
+5. Generate 4-6 thoughtful follow-up interview questions
+6. Provide an overall recommendation (strong_yes, yes, maybe, no, or strong_no)
+
+Analysis Depth: {analysis_depth}
+
+Respond with ONLY the JSON structure specified in the system prompt."""
+
+
+@lru_cache(maxsize=1024)
+def _render_position_fields(framework_json: str) -> tuple[str, str, str, str]:
+    """
+    Render the position-dependent prompt fragments
+
+    Keyed on the framework's canonical JSON: in a hiring funnel the same
+    position is evaluated against many candidates, so these joins and
+    title-casings are computed once per position instead of per CV.
+
+    Returns:
+        Tuple of (requirements_text, must_have, nice_to_have, weights_text)
+    """
+    framework = json.loads(framework_json)
+
+    requirements_text = "\n".join([
+        f"- {req}" for req in framework.get('key_requirements', [])
+    ])
+    must_have = ", ".join(framework.get('must_have_skills', []))
+    nice_to_have = ", ".join(framework.get('nice_to_have_skills', []))
+
+    weights = framework.get('scoring_weights', {})
+    weights_text = "\n".join([
+        f"- {section.replace('_', ' ').title()}: {weight}%"
+        for section, weight in weights.items()
+    ])
+
+    return requirements_text, must_have, nice_to_have, weights_text
+
+
+@lru_cache(maxsize=1024)
+def _render_company_fields(criteria_json: str) -> tuple[str, str]:
+    """
+    Render the company-dependent prompt fragments
+
+    Company criteria change even less often than positions; same caching
+    rationale as _render_position_fields.
+
+    Returns:
+        Tuple of (values_text, disqualifiers_text)
+    """
+    criteria = json.loads(criteria_json)
+
+    values_text = ", ".join(criteria.get('values', []))
+    disqualifiers = criteria.get('disqualifiers', [])
+    disqualifiers_text = ', '.join(disqualifiers) if disqualifiers else 'None specified'
+
+    return values_text, disqualifiers_text
+
+
 class PromptManager:
     """Manages versioned prompts for CV analysis"""
 
     def __init__(self, prompts_dir: str = "app/prompts"):
         self.prompts_dir = Path(prompts_dir)
         self._prompts_cache: Dict[str, str] = {}
+        self._prompt_mtimes: Dict[str, float] = {}
         self._load_prompts()
 
     def _load_prompts(self):
@@ -25,13 +146,36 @@ class PromptManager:
             return
 
         for prompt_file in self.prompts_dir.glob("*.txt"):
-            version = prompt_file.stem  # e.g., "v1_analysis" -> "v1_analysis"
+            self._load_prompt_file(prompt_file)
+
+    def _load_prompt_file(self, prompt_file: Path):
+        """Read one template and record its mtime for change detection"""
+        version = prompt_file.stem  # e.g., "v1_analysis" -> "v1_analysis"
+        try:
+            self._prompts_cache[version] = prompt_file.read_text(encoding='utf-8')
+            self._prompt_mtimes[version] = prompt_file.stat().st_mtime
+            logger.info(f"Loaded prompt template: {version}")
+        except Exception as e:
+            logger.error(f"Failed to load prompt {version}: {e}")
+
+    def reload_if_changed(self):
+        """
+        Re-read only the templates whose files changed on disk
+
+        Cheap enough to call from dev tooling; production keeps the
+        startup snapshot and never stats files on the request path.
+        """
+        if not self.prompts_dir.exists():
+            return
+
+        for prompt_file in self.prompts_dir.glob("*.txt"):
+            version = prompt_file.stem
             try:
-                with open(prompt_file, 'r', encoding='utf-8') as f:
-                    self._prompts_cache[version] = f.read()
-                logger.info(f"Loaded prompt template: {version}")
-            except Exception as e:
-                logger.error(f"Failed to load prompt {version}: {e}")
+                mtime = prompt_file.stat().st_mtime
+            except OSError:
+                continue
+            if mtime != self._prompt_mtimes.get(version):
+                self._load_prompt_file(prompt_file)
 
     def get_prompt(self, version: str = "v1") -> str:
         """
@@ -80,104 +224,36 @@ class PromptManager:
             Tuple of (system_prompt, user_prompt)
         """
 
-        # Build position requirements section
-        requirements_text = "\n".join([
-            f"- {req}" for req in position_framework.get('key_requirements', [])
-        ])
-
-        must_have = ", ".join(position_framework.get('must_have_skills', []))
-        nice_to_have = ", ".join(position_framework.get('nice_to_have_skills', []))
-
-        # Build company values section
-        values_text = ", ".join(company_criteria.get('values', []))
-
-        # Build scoring weights
-        weights = position_framework.get('scoring_weights', {})
-        weights_text = "\n".join([
-            f"- {section.replace('_', ' ').title()}: {weight}%"
-            for section, weight in weights.items()
-        ])
-
-        # System prompt
-        system_prompt = """You are an expert HR analyst specializing in candidate evaluation.
-Your task is to analyze CVs objectively and provide structured, data-driven assessments.
-
-IMPORTANT: You must respond with valid JSON only. Do not include any text outside the JSON structure.
-
-The JSON response must have this exact structure:
-{
-  "overall_score": <number 0-100>,
-  "recommendation": "<strong_yes|yes|maybe|no|strong_no>",
-  "section_scores": [
-    {
-      "section": "<section name>",
-      "score": <number 0-100>,
-      "weight": <number 0-100>,
-      "weighted_score": <calculated: score * weight / 100>,
-      "rationale": "<detailed explanation>"
-    }
-  ],
-  "key_strengths": ["<strength 1>", "<strength 2>", ...],
-  "critical_gaps": ["<gap 1>", "<gap 2>", ...],
-  "follow_up_questions": ["<question 1>", "<question 2>", ...]
-}
-
-Be objective, thorough, and ensure all scores are justified with clear rationale."""
-
-        # User prompt
-        user_prompt = f"""Analyze the following CV against the position requirements and company criteria.
-
-=== POSITION INFORMATION ===
-Role: {position_framework.get('role_title', 'Not specified')}
-
-Key Requirements:
-{requirements_text if requirements_text else 'Not specified'}
-
-Must-Have Skills: {must_have if must_have else 'Not specified'}
-Nice-to-Have Skills: {nice_to_have if nice_to_have else 'Not specified'}
-
-Scoring Weights:
-{weights_text}
-
-=== COMPANY CRITERIA ===
-Company: {company_criteria.get('company_name', 'Not specified')}
-Core Values: {values_text if values_text else 'Not specified'}
-
-Evaluation Guidelines:
-{company_criteria.get('evaluation_guidelines', 'Not specified')}
-
-Disqualifiers:
-{', '.join(company_criteria.get('disqualifiers', [])) if company_criteria.get('disqualifiers') else 'None specified'}
-
-=== CANDIDATE CV ===
-{cv_text}
-
-=== ANALYSIS INSTRUCTIONS ===
-1. Evaluate the candidate across all scoring dimensions (Technical Skills, Experience, Education, Cultural Fit)
-2. Calculate weighted scores based on the provided weights
-3. Identify 3-5 key strengths with specific evidence from the CV
-4. Identify 2-4 critical gaps or concerns
-5. Generate 4-6 thoughtful follow-up interview questions
-6. Provide an overall recommendation (strong_yes, yes, maybe, no, or strong_no)
-
-Analysis Depth: {analysis_depth}
-
-Respond with ONLY the JSON structure specified in the system prompt."""
-
-        return system_prompt, user_prompt
+        # Position and company fragments are cached by their canonical
+        # JSON, so repeat positions/companies cost one dict serialization
+        # and two lookups instead of re-rendering every join
+        requirements_text, must_have, nice_to_have, weights_text = \
+            _render_position_fields(json.dumps(position_framework, sort_keys=True))
+        values_text, disqualifiers_text = \
+            _render_company_fields(json.dumps(company_criteria, sort_keys=True))
+
+        user_prompt = USER_PROMPT_TEMPLATE.format(
+            role_title=position_framework.get('role_title') or 'Not specified',
+            requirements_text=requirements_text or 'Not specified',
+            must_have=must_have or 'Not specified',
+            nice_to_have=nice_to_have or 'Not specified',
+            weights_text=weights_text,
+            company_name=company_criteria.get('company_name') or 'Not specified',
+            values_text=values_text or 'Not specified',
+            evaluation_guidelines=company_criteria.get('evaluation_guidelines') or 'Not specified',
+            disqualifiers=disqualifiers_text,
+            cv_text=cv_text,
+            analysis_depth=analysis_depth
+        )
+
+        return SYSTEM_PROMPT, user_prompt
 
     def get_available_versions(self) -> list:
         """Get list of available prompt versions"""
         return list(self._prompts_cache.keys())
 
 
-# Global prompt manager instance
-_prompt_manager_instance: Optional[PromptManager] = None
-
-
+@lru_cache(maxsize=None)
 def get_prompt_manager() -> PromptManager:
     """Get or create the global prompt manager instance"""
-    global _prompt_manager_instance
-    if _prompt_manager_instance is None:
-        _prompt_manager_instance = PromptManager()
-    return _prompt_manager_instance
+    return PromptManager()
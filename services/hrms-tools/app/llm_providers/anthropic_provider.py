@@ -2,20 +2,55 @@
 Anthropic Claude LLM Provider Implementation
 """
 from typing import Optional
+import itertools
 import logging
-from anthropic import AsyncAnthropic, AnthropicError
-from .base import BaseLLMProvider, LLMResponse, LLMProviderError
+import anthropic
+from anthropic import AsyncAnthropic
+from .base import BaseLLMProvider, LLMResponse, LLMProviderError, classify_error
 
 logger = logging.getLogger(__name__)
 
+# SDK exception type -> (error kind, retryable), resolved via the
+# exception's MRO so subclasses inherit their nearest mapped ancestor
+_ERROR_MAP = {
+    anthropic.RateLimitError: ("rate limited", True),
+    anthropic.APITimeoutError: ("request timed out", True),
+    anthropic.APIConnectionError: ("connection failed", True),
+    anthropic.InternalServerError: ("server error", True),
+    anthropic.AuthenticationError: ("authentication failed", False),
+    anthropic.BadRequestError: ("bad request", False),
+    anthropic.APIStatusError: ("API error", False),
+}
+
 
 class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude provider implementation"""
 
     def __init__(self, api_key: str, model: str = "claude-3-5-sonnet-20241022",
-                 temperature: float = 0.3, max_tokens: int = 4000):
-        super().__init__(api_key, model, temperature, max_tokens)
-        self.client = AsyncAnthropic(api_key=api_key) if api_key else None
+                 temperature: float = 0.3, max_tokens: int = 4000,
+                 http_client=None):
+        # api_key may hold several comma-separated keys; requests are
+        # round-robined across them so throughput scales with the number
+        # of accounts instead of one account's rate limit
+        keys = [k.strip() for k in api_key.split(',') if k.strip()] if api_key else []
+        super().__init__(keys[0] if keys else api_key, model, temperature, max_tokens)
+        if keys:
+            # http_client lets the factory share one pooled httpx client
+            # across providers instead of each SDK building its own
+            self._clients = [
+                AsyncAnthropic(api_key=k, http_client=http_client) for k in keys
+            ]
+            self._client_cycle = itertools.cycle(self._clients)
+            self.client = self._clients[0]
+        else:
+            self.client = None
+        # Static request parameters never change after construction; build
+        # them once and merge per-call fields on top
+        self._base_kwargs = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
 
     async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> LLMResponse:
         """
@@ -38,13 +73,11 @@ class AnthropicProvider(BaseLLMProvider):
             )
 
         try:
-            logger.info(f"Calling Anthropic API with model: {self.model}")
+            logger.info("Calling Anthropic API with model: %s", self.model)
 
-            # Build request parameters
+            # Build request parameters on top of the preallocated template
             kwargs = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "temperature": self.temperature,
+                **self._base_kwargs,
                 "messages": [
                     {
                         "role": "user",
@@ -57,44 +90,44 @@ class AnthropicProvider(BaseLLMProvider):
             if system_prompt:
                 kwargs["system"] = system_prompt
 
-            response = await self.client.messages.create(**kwargs)
+            # Stream the response instead of blocking on the full message:
+            # text is accumulated as deltas arrive, and the event loop can
+            # schedule other requests between chunks
+            parts = []
+            client = next(self._client_cycle)
+            async with client.messages.stream(**kwargs) as stream:
+                async for text in stream.text_stream:
+                    parts.append(text)
+                response = await stream.get_final_message()
 
-            # Extract text content from response
-            content = ""
-            if response.content:
-                for block in response.content:
-                    if hasattr(block, 'text'):
-                        content += block.text
+            content = "".join(parts)
 
             # Calculate tokens used
             tokens_used = None
             if hasattr(response, 'usage'):
                 tokens_used = response.usage.input_tokens + response.usage.output_tokens
 
-            logger.info(f"Anthropic response received. Tokens used: {tokens_used}")
+            logger.info("Anthropic response received. Tokens used: %s", tokens_used)
 
+            # raw_response is left unset: nothing downstream reads it, and a
+            # full model_dump() of the message payload is a recursive
+            # serialization that only keeps the whole tree alive
             return LLMResponse(
                 content=content,
                 model=response.model,
                 tokens_used=tokens_used,
-                finish_reason=response.stop_reason,
-                raw_response=response.model_dump()
+                finish_reason=response.stop_reason
             )
 
-        except AnthropicError as e:
-            logger.error(f"Anthropic API error: {str(e)}")
-            raise LLMProviderError(
-                provider="anthropic",
-                message=f"Anthropic API call failed: {str(e)}",
-                original_error=e
-            )
         except Exception as e:
-            logger.error(f"Unexpected error in Anthropic provider: {str(e)}")
+            kind, retryable = classify_error(e, _ERROR_MAP)
+            logger.error("Anthropic %s: %s", kind, e)
             raise LLMProviderError(
                 provider="anthropic",
-                message=f"Unexpected error: {str(e)}",
-                original_error=e
-            )
+                message=f"Anthropic {kind}: {e}",
+                original_error=e,
+                retryable=retryable
+            ) from e
 
     def is_available(self) -> bool:
         """Check if Anthropic provider is available"""
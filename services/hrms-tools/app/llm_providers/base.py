@@ -2,11 +2,33 @@
 Base abstract class for LLM providers
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+def classify_error(error: Exception, error_map: Dict[type, Tuple[str, bool]]) -> Tuple[str, bool]:
+    """
+    Resolve an SDK exception to its (error kind, retryable) classification
+
+    Walks the exception's MRO rather than looking up the exact type, so
+    subclasses the map does not list explicitly (SDKs raise NotFoundError
+    and friends, never their APIStatusError base directly) inherit the
+    closest mapped ancestor's entry.
+
+    Args:
+        error: The exception raised by the SDK
+        error_map: Exception type -> (error kind, retryable)
+
+    Returns:
+        The mapped classification, or ("unexpected error", False)
+    """
+    for klass in type(error).__mro__:
+        if klass in error_map:
+            return error_map[klass]
+    return "unexpected error", False
+
+
+@dataclass(slots=True)
 class LLMResponse:
     """Standardized response from LLM providers"""
     content: str
@@ -87,8 +109,12 @@ class BaseLLMProvider(ABC):
 class LLMProviderError(Exception):
     """Exception raised when LLM provider encounters an error"""
 
-    def __init__(self, provider: str, message: str, original_error: Optional[Exception] = None):
+    def __init__(self, provider: str, message: str, original_error: Optional[Exception] = None,
+                 retryable: bool = False):
         self.provider = provider
         self.message = message
         self.original_error = original_error
+        # Structured flag for retry layers, so callers don't have to
+        # parse the message to decide whether a retry can help
+        self.retryable = retryable
         super().__init__(f"[{provider}] {message}")
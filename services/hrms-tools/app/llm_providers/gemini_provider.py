@@ -2,6 +2,7 @@
 Google Gemini LLM Provider Implementation
 """
 from typing import Optional
+import asyncio
 import logging
 import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
@@ -28,6 +29,10 @@ class GeminiProvider(BaseLLMProvider):
             )
         else:
             self.client = None
+        # Memoized system prefix: the system prompt is static across
+        # requests, so the prefix string is built once and reused
+        self._cached_system_prompt = None
+        self._system_prefix = ""
 
     async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> LLMResponse:
         """
@@ -50,63 +55,64 @@ class GeminiProvider(BaseLLMProvider):
             )
 
         try:
-            logger.info(f"Calling Gemini API with model: {self.model}")
+            logger.info("Calling Gemini API with model: %s", self.model)
 
-            # Combine system prompt and user prompt if system prompt exists
+            # Combine system prompt and user prompt if system prompt exists;
+            # the separator-joined prefix is cached since the system prompt
+            # rarely changes between calls
             full_prompt = prompt
             if system_prompt:
-                full_prompt = f"{system_prompt}\n\n{prompt}"
+                if system_prompt != self._cached_system_prompt:
+                    self._cached_system_prompt = system_prompt
+                    self._system_prefix = system_prompt + "\n\n"
+                full_prompt = self._system_prefix + prompt
 
             # Generate response
-            # Note: Gemini's Python SDK doesn't have native async support yet
-            # Using sync call - in production, consider running in thread pool
-            response = self.client.generate_content(
-                full_prompt,
-                generation_config={
-                    "temperature": self.temperature,
-                    "max_output_tokens": self.max_tokens,
-                }
+            # Gemini's Python SDK has no native async support, so run the
+            # blocking call in a worker thread; otherwise it would hold
+            # the event loop for the whole multi-second round-trip and
+            # serialize every concurrent request. generation_config is
+            # already bound to the model in __init__
+            response = await asyncio.to_thread(
+                self.client.generate_content,
+                full_prompt
             )
 
-            # Extract content
-            content = response.text if response.text else ""
+            # Read the first candidate once; response.text walks the same
+            # parts list and re-runs safety checks on every access
+            candidate = response.candidates[0] if response.candidates else None
+            content = (
+                "".join(part.text for part in candidate.content.parts)
+                if candidate else ""
+            )
+            finish_reason = str(candidate.finish_reason) if candidate else None
 
             # Get token counts if available
             tokens_used = None
-            if hasattr(response, 'usage_metadata'):
-                tokens_used = (
-                    response.usage_metadata.prompt_token_count +
-                    response.usage_metadata.candidates_token_count
-                )
+            usage = getattr(response, 'usage_metadata', None)
+            if usage:
+                tokens_used = usage.prompt_token_count + usage.candidates_token_count
 
-            # Get finish reason
-            finish_reason = None
-            if response.candidates and len(response.candidates) > 0:
-                finish_reason = str(response.candidates[0].finish_reason)
-
-            logger.info(f"Gemini response received. Tokens used: {tokens_used}")
+            logger.info("Gemini response received. Tokens used: %s", tokens_used)
 
+            # raw_response stays unset; its dict only duplicated the three
+            # fields already on the LLMResponse
             return LLMResponse(
                 content=content,
                 model=self.model,
                 tokens_used=tokens_used,
-                finish_reason=finish_reason,
-                raw_response={
-                    "text": content,
-                    "usage": tokens_used,
-                    "finish_reason": finish_reason
-                }
+                finish_reason=finish_reason
             )
 
         except google_exceptions.GoogleAPIError as e:
-            logger.error(f"Gemini API error: {str(e)}")
+            logger.error("Gemini API error: %s", e)
             raise LLMProviderError(
                 provider="gemini",
                 message=f"Gemini API call failed: {str(e)}",
                 original_error=e
             )
         except Exception as e:
-            logger.error(f"Unexpected error in Gemini provider: {str(e)}")
+            logger.error("Unexpected error in Gemini provider: %s", e)
             raise LLMProviderError(
                 provider="gemini",
                 message=f"Unexpected error: {str(e)}",
@@ -0,0 +1,51 @@
+"""
+Async rate limiting for LLM provider calls
+"""
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket that self-throttles callers to a requests-per-minute rate
+
+    Providers enforce RPM limits with 429s; hitting those triggers retry
+    storms that multiply latency. Waiting here instead keeps bursts inside
+    the known limit and costs only local sleep time.
+    """
+
+    def __init__(self, rate_per_minute: int, capacity: int = None):
+        """
+        Initialize the bucket
+
+        Args:
+            rate_per_minute: Sustained request rate to allow
+            capacity: Maximum burst size (defaults to one second's worth,
+                minimum 1)
+        """
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate_per_second)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        """
+        Wait until the bucket holds enough tokens, then take them
+
+        Args:
+            tokens: Cost of the call (1.0 for one request)
+        """
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate_per_second
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate_per_second
+            await asyncio.sleep(wait)
@@ -2,20 +2,48 @@
 OpenAI LLM Provider Implementation
 """
 from typing import Optional
+import itertools
 import logging
-from openai import AsyncOpenAI, OpenAIError
-from .base import BaseLLMProvider, LLMResponse, LLMProviderError
+import openai
+from openai import AsyncOpenAI
+from .base import BaseLLMProvider, LLMResponse, LLMProviderError, classify_error
 
 logger = logging.getLogger(__name__)
 
+# SDK exception type -> (error kind, retryable), resolved via the
+# exception's MRO so subclasses inherit their nearest mapped ancestor
+_ERROR_MAP = {
+    openai.RateLimitError: ("rate limited", True),
+    openai.APITimeoutError: ("request timed out", True),
+    openai.APIConnectionError: ("connection failed", True),
+    openai.InternalServerError: ("server error", True),
+    openai.AuthenticationError: ("authentication failed", False),
+    openai.BadRequestError: ("bad request", False),
+    openai.APIStatusError: ("API error", False),
+}
+
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI GPT provider implementation"""
 
     def __init__(self, api_key: str, model: str = "gpt-4-turbo-preview",
-                 temperature: float = 0.3, max_tokens: int = 4000):
-        super().__init__(api_key, model, temperature, max_tokens)
-        self.client = AsyncOpenAI(api_key=api_key) if api_key else None
+                 temperature: float = 0.3, max_tokens: int = 4000,
+                 http_client=None):
+        # api_key may hold several comma-separated keys; requests are
+        # round-robined across them so throughput scales with the number
+        # of accounts instead of one account's rate limit
+        keys = [k.strip() for k in api_key.split(',') if k.strip()] if api_key else []
+        super().__init__(keys[0] if keys else api_key, model, temperature, max_tokens)
+        if keys:
+            # http_client lets the factory share one pooled httpx client
+            # across providers instead of each SDK building its own
+            self._clients = [
+                AsyncOpenAI(api_key=k, http_client=http_client) for k in keys
+            ]
+            self._client_cycle = itertools.cycle(self._clients)
+            self.client = self._clients[0]
+        else:
+            self.client = None
 
     async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> LLMResponse:
         """
@@ -51,44 +79,61 @@ class OpenAIProvider(BaseLLMProvider):
                 "content": prompt
             })
 
-            logger.info(f"Calling OpenAI API with model: {self.model}")
+            logger.info("Calling OpenAI API with model: %s", self.model)
 
-            response = await self.client.chat.completions.create(
+            # Stream the response instead of blocking on the full
+            # completion: deltas are accumulated as they arrive, and the
+            # event loop gets scheduling points throughout the generation
+            client = next(self._client_cycle)
+            stream = await client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                response_format={"type": "json_object"}  # Request JSON output
+                response_format={"type": "json_object"},  # Request JSON output
+                stream=True,
+                stream_options={"include_usage": True}
             )
 
-            content = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens if response.usage else None
-            finish_reason = response.choices[0].finish_reason
-
-            logger.info(f"OpenAI response received. Tokens used: {tokens_used}")
-
+            parts = []
+            model = self.model
+            tokens_used = None
+            finish_reason = None
+            async for chunk in stream:
+                if chunk.model:
+                    model = chunk.model
+                if chunk.usage:
+                    tokens_used = chunk.usage.total_tokens
+                if chunk.choices:
+                    choice = chunk.choices[0]
+                    if choice.delta and choice.delta.content:
+                        parts.append(choice.delta.content)
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+
+            content = "".join(parts)
+
+            logger.info("OpenAI response received. Tokens used: %s", tokens_used)
+
+            # raw_response stays unset: nothing downstream reads it, and
+            # model_dump() serialized the whole completion object (choices,
+            # logprobs, usage, fingerprints) into a throwaway dict per call
             return LLMResponse(
                 content=content,
-                model=response.model,
+                model=model,
                 tokens_used=tokens_used,
-                finish_reason=finish_reason,
-                raw_response=response.model_dump()
+                finish_reason=finish_reason
             )
 
-        except OpenAIError as e:
-            logger.error(f"OpenAI API error: {str(e)}")
-            raise LLMProviderError(
-                provider="openai",
-                message=f"OpenAI API call failed: {str(e)}",
-                original_error=e
-            )
         except Exception as e:
-            logger.error(f"Unexpected error in OpenAI provider: {str(e)}")
+            kind, retryable = classify_error(e, _ERROR_MAP)
+            logger.error("OpenAI %s: %s", kind, e)
             raise LLMProviderError(
                 provider="openai",
-                message=f"Unexpected error: {str(e)}",
-                original_error=e
-            )
+                message=f"OpenAI {kind}: {e}",
+                original_error=e,
+                retryable=retryable
+            ) from e
 
     def is_available(self) -> bool:
         """Check if OpenAI provider is available"""
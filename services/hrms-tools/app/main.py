@@ -2,15 +2,17 @@
 CV Analysis Service - Main Application
 FastAPI application for analyzing candidate CVs
 """
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from app.core.config import get_settings
 from app.api.v1 import analyze
 from app.core.llm_factory import get_llm_factory
+from app.core.prompt_manager import get_prompt_manager
 
 # Configure logging
 logging.basicConfig(
@@ -32,7 +34,8 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
 
-    # Initialize LLM factory to check provider availability
+    # Warm the cached singletons so the first request pays no setup cost
+    get_prompt_manager()
     llm_factory = get_llm_factory()
     available_providers = llm_factory.get_available_providers()
 
@@ -45,9 +48,19 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("✓ Service ready to accept requests")
 
+    # Keep the factory's cached availability snapshot current without
+    # re-probing providers on the request path
+    async def refresh_provider_availability():
+        while True:
+            await asyncio.sleep(settings.PROVIDER_REFRESH_INTERVAL_SECONDS)
+            llm_factory.refresh_availability()
+
+    refresh_task = asyncio.create_task(refresh_provider_availability())
+
     yield
 
     # Shutdown
+    refresh_task.cancel()
     logger.info("Shutting down service")
 
 
@@ -69,16 +82,22 @@ app = FastAPI(
     """,
     lifespan=lifespan,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson serializes the large analysis responses several times faster
+    # than stdlib json
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Add CORS middleware. Credentials are only allowed alongside explicit
+# origins (browsers reject wildcard+credentials anyway), and max_age lets
+# warm clients skip the OPTIONS preflight for a day
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=list(settings.CORS_ORIGINS) or ["*"],
+    allow_credentials=bool(settings.CORS_ORIGINS),
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,
 )
 
 
@@ -86,8 +105,8 @@ app.add_middleware(
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle uncaught exceptions"""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %r", exc, exc_info=settings.DEBUG)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "InternalServerError",
@@ -125,5 +144,9 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        # reload requires a single process; otherwise scale across cores
+        workers=1 if settings.DEBUG else settings.WORKERS,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
@@ -3,7 +3,20 @@ Request models for CV Analysis API
 """
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict, List
-import base64
+import re
+
+# Allowed CV file extensions; precomputed once so per-request validation
+# is a single suffix slice and set lookup
+ALLOWED_CV_EXTENSIONS = frozenset({'.pdf', '.doc', '.docx'})
+
+# Structural check for base64 payloads; validation only needs to reject
+# obviously malformed input, the real decode happens once in the parser
+_BASE64_RE = re.compile(r'[A-Za-z0-9+/=\s]*\Z')
+
+# Config allowlists, hoisted so validators do a set lookup instead of
+# rebuilding a list per request
+ALLOWED_LLM_PROVIDERS = frozenset({'openai', 'anthropic', 'gemini', 'auto'})
+ALLOWED_ANALYSIS_DEPTHS = frozenset({'quick', 'detailed'})
 
 
 class ScoringWeights(BaseModel):
@@ -51,19 +64,19 @@ class AnalysisConfig(BaseModel):
     @classmethod
     def validate_provider(cls, v):
         """Validate LLM provider"""
-        allowed = ['openai', 'anthropic', 'gemini', 'auto']
-        if v.lower() not in allowed:
-            raise ValueError(f"LLM provider must be one of {allowed}")
-        return v.lower()
+        v = v.lower()
+        if v not in ALLOWED_LLM_PROVIDERS:
+            raise ValueError(f"LLM provider must be one of {sorted(ALLOWED_LLM_PROVIDERS)}")
+        return v
 
     @field_validator('analysis_depth')
     @classmethod
     def validate_depth(cls, v):
         """Validate analysis depth"""
-        allowed = ['quick', 'detailed']
-        if v.lower() not in allowed:
-            raise ValueError(f"Analysis depth must be one of {allowed}")
-        return v.lower()
+        v = v.lower()
+        if v not in ALLOWED_ANALYSIS_DEPTHS:
+            raise ValueError(f"Analysis depth must be one of {sorted(ALLOWED_ANALYSIS_DEPTHS)}")
+        return v
 
 
 class CVAnalysisRequest(BaseModel):
@@ -82,21 +95,22 @@ class CVAnalysisRequest(BaseModel):
             # It's a URL
             return v
 
-        # Try to validate as base64
-        try:
-            # Try to decode to verify it's valid base64
-            base64.b64decode(v, validate=True)
-            return v
-        except Exception:
+        # Check only the leading slice for base64 alphabet violations;
+        # decoding the whole multi-MB payload here just to throw the
+        # result away cost tens of ms per request. The parser decodes
+        # once for real and rejects anything this check lets through
+        if not _BASE64_RE.match(v[:4096]):
             raise ValueError("cv_file must be either a valid URL or base64 encoded string")
+        return v
 
     @field_validator('cv_filename')
     @classmethod
     def validate_filename(cls, v):
         """Validate file extension"""
-        allowed_extensions = ['.pdf', '.doc', '.docx']
-        if not any(v.lower().endswith(ext) for ext in allowed_extensions):
-            raise ValueError(f"File must have one of these extensions: {allowed_extensions}")
+        dot = v.rfind('.')
+        ext = v[dot:].lower() if dot >= 0 else ''
+        if ext not in ALLOWED_CV_EXTENSIONS:
+            raise ValueError(f"File must have one of these extensions: {sorted(ALLOWED_CV_EXTENSIONS)}")
         return v
 
     class Config:
@@ -2,9 +2,14 @@
 Audit Logging Service
 Logs all CV analysis requests and responses for audit trail
 """
+import atexit
 import sqlite3
 import logging
 import json
+import queue
+import threading
+import time
+from collections import namedtuple
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from pathlib import Path
@@ -12,27 +17,130 @@ from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Summary row returned by get_recent_analyses: a lightweight tuple with
+# attribute access instead of a per-row dict with string keys
+AnalysisLogSummary = namedtuple('AnalysisLogSummary', [
+    'analysis_id', 'timestamp', 'cv_filename',
+    'overall_score', 'recommendation', 'status'
+])
+
 
 class AuditLogger:
     """Handles audit logging of CV analysis operations"""
 
+    # Flusher tuning: drain up to FLUSH_BATCH_SIZE rows or wait
+    # FLUSH_INTERVAL_SECONDS after the first queued row, whichever
+    # comes first, then commit the whole batch at once
+    FLUSH_BATCH_SIZE = 100
+    FLUSH_INTERVAL_SECONDS = 0.05
+
+    # Bump when _ensure_database's DDL changes so existing databases
+    # re-run setup once; matching PRAGMA user_version skips it entirely
+    SCHEMA_VERSION = 1
+
+    # Hot-path SQL as class constants: sqlite3's per-connection statement
+    # cache is keyed on the SQL string, so passing the identical object
+    # every call guarantees a cache hit instead of a re-parse
+    _SQL_INSERT_LOG = '''
+        INSERT OR IGNORE INTO cv_analysis_logs (
+            analysis_id, timestamp, cv_filename, position_title,
+            company_name, llm_provider, llm_model, prompt_version,
+            tokens_used, processing_time_ms, overall_score,
+            recommendation, status, error_message
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    _SQL_UPSERT_TOKENS = '''
+        INSERT INTO token_usage (date, llm_provider, total_tokens, request_count)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(date, llm_provider)
+        DO UPDATE SET
+            total_tokens = total_tokens + excluded.total_tokens,
+            request_count = request_count + excluded.request_count
+    '''
+
+    _SQL_SELECT_BY_ID = 'SELECT * FROM cv_analysis_logs WHERE analysis_id = ?'
+
+    _SQL_SELECT_RECENT = '''
+        SELECT analysis_id, timestamp, cv_filename,
+               overall_score, recommendation, status
+        FROM cv_analysis_logs
+        ORDER BY timestamp DESC
+        LIMIT ?
+    '''
+
+    _SQL_TOKEN_STATS = '''
+        SELECT
+            llm_provider,
+            SUM(total_tokens) as total_tokens,
+            SUM(request_count) as total_requests,
+            AVG(total_tokens * 1.0 / request_count) as avg_tokens_per_request
+        FROM token_usage
+        WHERE date >= date('now', '-' || ? || ' days')
+        GROUP BY llm_provider
+    '''
+
     def __init__(self, db_path: str = "database/audit_logs.db"):
         self.db_path = db_path
+        # One long-lived connection instead of connect/close per call:
+        # each open re-paid file opens plus WAL/shm mapping. Audit methods
+        # run in Starlette's thread pool, so the connection is shared
+        # across threads behind a re-entrant lock
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=256
+        )
+        self._conn.row_factory = sqlite3.Row  # Enable column access by name
+        # WAL lets readers run concurrently with the audit writes, and
+        # synchronous=NORMAL drops to one fsync per commit (a torn write
+        # can lose the last commit, acceptable for an audit trail).
+        # temp_store/cache_size keep sorts and hot pages in memory
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-64000")
         self._ensure_database()
+        # Writes are queued and committed in batches by a background
+        # thread so each analysis pays one queue.put instead of an fsync;
+        # a batch of N rows costs a single commit
+        self._write_queue: queue.Queue = queue.Queue()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="audit-log-flusher", daemon=True
+        )
+        self._flush_thread.start()
+        atexit.register(self.close)
+
+    def close(self):
+        """Flush pending writes and close the connection (atexit hook)"""
+        if self._flush_thread.is_alive():
+            self._write_queue.put(None)  # Shutdown sentinel
+            self._flush_thread.join(timeout=5)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     def _ensure_database(self):
         """Create database and tables if they don't exist"""
-        # Ensure directory exists
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-
         with self._get_connection() as conn:
+            # One PRAGMA read replaces five DDL statements (each a parse
+            # plus schema-lock plus catalog walk) on every warm start
+            if conn.execute("PRAGMA user_version").fetchone()[0] == self.SCHEMA_VERSION:
+                return
+
             cursor = conn.cursor()
 
-            # Create audit logs table
+            # Create audit logs table. analysis_id is the natural lookup
+            # key, so it is the primary key and the table is WITHOUT
+            # ROWID: lookups are one B-tree traversal instead of an index
+            # probe plus a rowid fetch, and there is no surrogate id to
+            # store. Existing databases keep their original rowid schema
+            # (IF NOT EXISTS leaves them untouched), which the queries
+            # handle identically
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS cv_analysis_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    analysis_id TEXT UNIQUE NOT NULL,
+                    analysis_id TEXT PRIMARY KEY NOT NULL,
                     timestamp TIMESTAMP NOT NULL,
                     cv_filename TEXT NOT NULL,
                     position_title TEXT,
@@ -47,7 +155,7 @@ class AuditLogger:
                     status TEXT NOT NULL,
                     error_message TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                ) WITHOUT ROWID
             ''')
 
             # Create index for faster queries
@@ -56,36 +164,118 @@ class AuditLogger:
                 ON cv_analysis_logs(timestamp)
             ''')
 
+            # Covering index for get_recent_analyses: holds every column
+            # that query selects (analysis_id rides along as the primary
+            # key), so the newest-N listing never touches the table
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_analysis_id
-                ON cv_analysis_logs(analysis_id)
+                CREATE INDEX IF NOT EXISTS idx_recent_covering
+                ON cv_analysis_logs(
+                    timestamp, cv_filename, overall_score, recommendation, status
+                )
             ''')
 
-            # Create token usage tracking table
+            # Create token usage tracking table. The (date, provider)
+            # pair is the real key, so it replaces the surrogate id and
+            # the separate UNIQUE constraint
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS token_usage (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                     date DATE NOT NULL,
                     llm_provider TEXT NOT NULL,
                     total_tokens INTEGER NOT NULL,
                     request_count INTEGER NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(date, llm_provider)
-                )
+                    PRIMARY KEY (date, llm_provider)
+                ) WITHOUT ROWID
             ''')
 
+            # Covering index for get_token_usage_stats: the date-range
+            # filter, GROUP BY key, and both summed columns all live in
+            # the index, so the query never touches the table
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_token_usage_covering
+                ON token_usage(date, llm_provider, total_tokens, request_count)
+            ''')
+
+            # PRAGMA takes no bound parameters; SCHEMA_VERSION is a
+            # trusted class constant
+            cursor.execute(f"PRAGMA user_version = {int(self.SCHEMA_VERSION)}")
+
             conn.commit()
             logger.info("Audit database initialized")
 
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+        """Yield the shared connection under the instance lock"""
+        with self._lock:
+            yield self._conn
+
+    def _flush_loop(self):
+        """Drain queued log rows and commit them in batches"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                self._write_queue.task_done()
+                return
+            # Group-commit: collect rows that arrive within the flush
+            # window so a burst of analyses shares one fsync
+            batch = [item]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL_SECONDS
+            while len(batch) < self.FLUSH_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    next_item = self._write_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if next_item is None:
+                    self._flush_batch(batch)
+                    for _ in batch:
+                        self._write_queue.task_done()
+                    self._write_queue.task_done()
+                    return
+                batch.append(next_item)
+            self._flush_batch(batch)
+            for _ in batch:
+                self._write_queue.task_done()
+
+    def _flush_batch(self, batch):
+        """Write a batch of queued (log_row, token_update) pairs"""
         try:
-            yield conn
-        finally:
-            conn.close()
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                # OR IGNORE keeps a duplicate analysis_id from aborting
+                # the rest of the batch
+                cursor.executemany(
+                    self._SQL_INSERT_LOG, [log_row for log_row, _ in batch]
+                )
+
+                # Aggregate token counts per (date, provider) first so a
+                # batch issues one upsert per key instead of one per row
+                token_totals: dict = {}
+                for _, token_update in batch:
+                    if token_update:
+                        day, provider, tokens = token_update
+                        totals = token_totals.get((day, provider))
+                        if totals is None:
+                            token_totals[(day, provider)] = [tokens, 1]
+                        else:
+                            totals[0] += tokens
+                            totals[1] += 1
+                if token_totals:
+                    cursor.executemany(self._SQL_UPSERT_TOKENS, [
+                        (day, provider, tokens, count)
+                        for (day, provider), (tokens, count) in token_totals.items()
+                    ])
+
+                conn.commit()
+                logger.info("Flushed %d audit log entries", len(batch))
+        except Exception as e:
+            logger.error("Failed to flush audit log batch: %s", e)
+
+    def flush_pending(self):
+        """Block until every queued write has been committed"""
+        self._write_queue.join()
 
     def log_analysis(
         self,
@@ -121,68 +311,65 @@ class AuditLogger:
             status: Status of analysis (success, error, partial)
             error_message: Error message if failed
         """
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-
-                cursor.execute('''
-                    INSERT INTO cv_analysis_logs (
-                        analysis_id, timestamp, cv_filename, position_title,
-                        company_name, llm_provider, llm_model, prompt_version,
-                        tokens_used, processing_time_ms, overall_score,
-                        recommendation, status, error_message
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    analysis_id,
-                    datetime.utcnow(),
-                    cv_filename,
-                    position_title,
-                    company_name,
-                    llm_provider,
-                    llm_model,
-                    prompt_version,
-                    tokens_used,
-                    processing_time_ms,
-                    overall_score,
-                    recommendation,
-                    status,
-                    error_message
-                ))
-
-                conn.commit()
-
-                # Update token usage stats
-                if tokens_used and status == "success":
-                    self._update_token_usage(llm_provider, tokens_used)
+        now = datetime.utcnow()
+        log_row = (
+            analysis_id,
+            now,
+            cv_filename,
+            position_title,
+            company_name,
+            llm_provider,
+            llm_model,
+            prompt_version,
+            tokens_used,
+            processing_time_ms,
+            overall_score,
+            recommendation,
+            status,
+            error_message
+        )
+        token_update = None
+        if tokens_used and status == "success":
+            token_update = (now.date(), llm_provider, tokens_used)
+
+        # Non-blocking: the background flusher commits queued rows in
+        # batches so the request path never waits on an fsync
+        self._write_queue.put((log_row, token_update))
+        logger.info("Queued analysis log: %s - %s", analysis_id, status)
+
+    def prune_old_logs(self, retention_days: int = 90) -> int:
+        """
+        Delete audit rows older than the retention window
 
-                logger.info(f"Logged analysis: {analysis_id} - {status}")
+        Keeps the hot table small so the recent-analyses and stats
+        queries scan a bounded range regardless of historical volume;
+        freed pages are reused by subsequent inserts.
 
-        except sqlite3.IntegrityError as e:
-            logger.warning(f"Duplicate analysis_id or constraint violation: {e}")
-        except Exception as e:
-            logger.error(f"Failed to log analysis: {e}")
+        Args:
+            retention_days: Age in days beyond which rows are deleted
 
-    def _update_token_usage(self, llm_provider: str, tokens: int):
-        """Update daily token usage statistics"""
+        Returns:
+            Number of analysis log rows deleted
+        """
+        self.flush_pending()
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                today = datetime.utcnow().date()
-
-                # Try to update existing record
                 cursor.execute('''
-                    INSERT INTO token_usage (date, llm_provider, total_tokens, request_count)
-                    VALUES (?, ?, ?, 1)
-                    ON CONFLICT(date, llm_provider)
-                    DO UPDATE SET
-                        total_tokens = total_tokens + ?,
-                        request_count = request_count + 1
-                ''', (today, llm_provider, tokens, tokens))
-
+                    DELETE FROM cv_analysis_logs
+                    WHERE timestamp < datetime('now', '-' || ? || ' days')
+                ''', (retention_days,))
+                deleted = cursor.rowcount
+                cursor.execute('''
+                    DELETE FROM token_usage
+                    WHERE date < date('now', '-' || ? || ' days')
+                ''', (retention_days,))
                 conn.commit()
-
+                logger.info("Pruned %d audit log rows older than %d days", deleted, retention_days)
+                return deleted
         except Exception as e:
-            logger.error(f"Failed to update token usage: {e}")
+            logger.error("Failed to prune audit logs: %s", e)
+            return 0
 
     def get_analysis_by_id(self, analysis_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -194,13 +381,12 @@ class AuditLogger:
         Returns:
             Dict with analysis log data or None if not found
         """
+        # Drain queued writes so readers see their own recent logs
+        self.flush_pending()
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    'SELECT * FROM cv_analysis_logs WHERE analysis_id = ?',
-                    (analysis_id,)
-                )
+                cursor.execute(self._SQL_SELECT_BY_ID, (analysis_id,))
                 row = cursor.fetchone()
 
                 if row:
@@ -211,7 +397,7 @@ class AuditLogger:
             logger.error(f"Failed to retrieve analysis: {e}")
             return None
 
-    def get_recent_analyses(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_recent_analyses(self, limit: int = 10) -> List[AnalysisLogSummary]:
         """
         Get recent analysis logs
 
@@ -219,18 +405,16 @@ class AuditLogger:
             limit: Maximum number of records to return
 
         Returns:
-            List of analysis log dicts
+            List of AnalysisLogSummary rows (attribute access, no
+            per-row dict allocation)
         """
+        self.flush_pending()
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM cv_analysis_logs
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ''', (limit,))
+                cursor.execute(self._SQL_SELECT_RECENT, (limit,))
 
-                return [dict(row) for row in cursor.fetchall()]
+                return [AnalysisLogSummary(*row) for row in cursor.fetchall()]
 
         except Exception as e:
             logger.error(f"Failed to retrieve recent analyses: {e}")
@@ -246,21 +430,13 @@ class AuditLogger:
         Returns:
             Dict with usage statistics by provider
         """
+        self.flush_pending()
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
 
                 # Get usage by provider for last N days
-                cursor.execute('''
-                    SELECT
-                        llm_provider,
-                        SUM(total_tokens) as total_tokens,
-                        SUM(request_count) as total_requests,
-                        AVG(total_tokens * 1.0 / request_count) as avg_tokens_per_request
-                    FROM token_usage
-                    WHERE date >= date('now', '-' || ? || ' days')
-                    GROUP BY llm_provider
-                ''', (days,))
+                cursor.execute(self._SQL_TOKEN_STATS, (days,))
 
                 stats = {}
                 for row in cursor.fetchall():
@@ -2,13 +2,24 @@
 CV Analyzer Service
 Main orchestrator for CV analysis workflow
 """
+import asyncio
 import json
 import logging
+import re
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any
 import time
 
+from fastapi import BackgroundTasks
+
+# orjson parses the multi-KB LLM JSON responses several times faster
+# than stdlib json; fall back to stdlib where it is unavailable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from app.models.request import CVAnalysisRequest
 from app.models.response import (
     CVAnalysisResponse,
@@ -17,13 +28,25 @@ from app.models.response import (
     RecommendationType
 )
 from app.services.document_parser import get_document_parser, DocumentParserError
+from app.core.config import get_settings
 from app.core.llm_factory import get_llm_factory
 from app.core.prompt_manager import get_prompt_manager
 from app.services.audit_logger import get_audit_logger
+from app.services.response_cache import ResponseCache, get_response_cache
 from app.llm_providers.base import LLMProviderError
 
 logger = logging.getLogger(__name__)
 
+# Matches an LLM response wrapped in a markdown code fence (with an
+# optional language tag) and captures the body in one pass
+_FENCE_RE = re.compile(r'```[a-zA-Z0-9_+-]*\n?(.*?)\n?```\Z', re.DOTALL)
+
+# Fields every LLM analysis response must contain
+_REQUIRED_FIELDS = frozenset({
+    'overall_score', 'recommendation', 'section_scores',
+    'key_strengths', 'critical_gaps', 'follow_up_questions'
+})
+
 
 class CVAnalyzerError(Exception):
     """Exception raised when CV analysis fails"""
@@ -38,13 +61,54 @@ class CVAnalyzer:
         self.llm_factory = get_llm_factory()
         self.prompt_manager = get_prompt_manager()
         self.audit_logger = get_audit_logger()
+        self.response_cache = get_response_cache()
+        # Bound in-flight LLM calls so a burst of requests queues here
+        # instead of piling timeouts onto the provider
+        self._llm_semaphore = asyncio.Semaphore(
+            get_settings().MAX_CONCURRENT_LLM_CALLS
+        )
+
+    def _make_cache_key(self, request: CVAnalysisRequest, cv_bytes: bytes | None) -> str:
+        """Build the response-cache key from everything that affects the result"""
+        return ResponseCache.make_key(
+            cv_bytes if cv_bytes is not None else request.cv_file,
+            request.position_framework.model_dump_json(),
+            request.company_criteria.model_dump_json(),
+            request.config.llm_provider,
+            request.config.prompt_version,
+            request.config.analysis_depth
+        )
+
+    def _make_text_cache_key(self, request: CVAnalysisRequest, cv_text: str) -> str:
+        """
+        Second-level cache key over the whitespace-normalized extracted text,
+        so re-encoded copies of the same CV (re-saved PDF, base64 vs
+        multipart) still hit the cache even though their bytes differ
+        """
+        return ResponseCache.make_key(
+            " ".join(cv_text.split()),
+            request.position_framework.model_dump_json(),
+            request.company_criteria.model_dump_json(),
+            request.config.llm_provider,
+            request.config.prompt_version,
+            request.config.analysis_depth
+        )
 
-    async def analyze(self, request: CVAnalysisRequest) -> CVAnalysisResponse:
+    async def analyze(
+        self,
+        request: CVAnalysisRequest,
+        background_tasks: BackgroundTasks | None = None,
+        cv_bytes: bytes | None = None
+    ) -> CVAnalysisResponse:
         """
         Perform complete CV analysis
 
         Args:
             request: CV analysis request with all required data
+            background_tasks: Optional FastAPI BackgroundTasks; when provided,
+                audit logging is deferred until after the response is sent
+            cv_bytes: Raw CV content from a multipart upload; when provided,
+                request.cv_file is ignored and no base64 decode happens
 
         Returns:
             CVAnalysisResponse with structured analysis results
@@ -52,34 +116,95 @@ class CVAnalyzer:
         Raises:
             CVAnalyzerError: If analysis fails at any step
         """
-        analysis_id = str(uuid.uuid4())
+        # .hex skips the dash formatting of str(uuid4()); the ID stays a
+        # unique opaque token either way
+        analysis_id = uuid.uuid4().hex
         start_time = time.time()
 
-        logger.info(f"Starting CV analysis {analysis_id} for {request.cv_filename}")
+        logger.info("Starting CV analysis %s for %s", analysis_id, request.cv_filename)
+
+        # Serve an identical recent request from cache without an LLM call
+        cache_key = self._make_cache_key(request, cv_bytes)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Analysis %s served from response cache", analysis_id)
+            response = cached.model_copy(update={
+                "analysis_id": analysis_id,
+                "timestamp": datetime.now(timezone.utc)
+            })
+            # Every issued analysis_id must resolve in the audit DB, so
+            # cache hits get a row too (status "cached", no token spend)
+            self._log_analysis(
+                analysis_id=analysis_id,
+                request=request,
+                response=response,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                status="cached",
+                background_tasks=background_tasks
+            )
+            return response
 
         try:
             # Step 1: Parse CV document
-            cv_text, page_count = self._parse_document(request)
-
-            # Step 2: Get LLM provider
-            llm_provider = self.llm_factory.get_provider(request.config.llm_provider)
-
-            # Step 3: Build analysis prompt
+            cv_text, page_count = self._parse_document(request, cv_bytes)
+
+            # Second-level cache check on the extracted text: catches the
+            # same CV content arriving as different bytes, which the raw
+            # content key above cannot
+            text_cache_key = self._make_text_cache_key(request, cv_text)
+            cached = self.response_cache.get(text_cache_key)
+            if cached is not None:
+                logger.info("Analysis %s served from text-level response cache", analysis_id)
+                response = cached.model_copy(update={
+                    "analysis_id": analysis_id,
+                    "timestamp": datetime.now(timezone.utc)
+                })
+                self._log_analysis(
+                    analysis_id=analysis_id,
+                    request=request,
+                    response=response,
+                    processing_time_ms=int((time.time() - start_time) * 1000),
+                    status="cached",
+                    background_tasks=background_tasks
+                )
+                return response
+
+            # Parsing is done and both cache keys are computed, so nothing
+            # reads the multi-MB base64 payload again; drop it now instead
+            # of holding it across the long LLM await
+            if cv_bytes is None and request.cv_file:
+                request.cv_file = ""
+
+            # Step 2: Build analysis prompt
             system_prompt, user_prompt = self._build_prompt(request, cv_text)
 
-            # Step 4: Call LLM for analysis
-            llm_response = await llm_provider.generate(user_prompt, system_prompt)
-
-            # Step 5: Parse LLM response into structured format
+            # Step 3: Call LLM for analysis (bounded concurrency, and
+            # self-throttled to the provider's request rate so bursts
+            # queue locally instead of triggering 429 retry storms).
+            # 'auto' can optionally hedge across providers and take the
+            # first success
+            if request.config.llm_provider == 'auto' and get_settings().HEDGED_AUTO_REQUESTS:
+                async with self._llm_semaphore:
+                    llm_response, provider_name = await self.llm_factory.generate_hedged(
+                        user_prompt, system_prompt
+                    )
+            else:
+                llm_provider = self.llm_factory.get_provider(request.config.llm_provider)
+                provider_name = llm_provider.get_provider_name()
+                async with self._llm_semaphore:
+                    await self.llm_factory.acquire_rate_limit(provider_name)
+                    llm_response = await llm_provider.generate(user_prompt, system_prompt)
+
+            # Step 4: Parse LLM response into structured format
             analysis_result = self._parse_llm_response(llm_response.content)
 
-            # Step 6: Build response
+            # Step 5: Build response
             processing_time_ms = int((time.time() - start_time) * 1000)
 
             response = self._build_response(
                 analysis_id=analysis_id,
                 analysis_result=analysis_result,
-                llm_provider=llm_provider.get_provider_name(),
+                llm_provider=provider_name,
                 llm_model=llm_response.model,
                 prompt_version=request.config.prompt_version,
                 tokens_used=llm_response.tokens_used,
@@ -87,39 +212,45 @@ class CVAnalyzer:
                 page_count=page_count
             )
 
-            # Step 7: Audit log
+            # Step 6: Audit log
             self._log_analysis(
                 analysis_id=analysis_id,
                 request=request,
                 response=response,
                 processing_time_ms=processing_time_ms,
-                status="success"
+                status="success",
+                background_tasks=background_tasks
             )
 
-            logger.info(f"Analysis {analysis_id} completed successfully in {processing_time_ms}ms")
+            self.response_cache.set(cache_key, response)
+            self.response_cache.set(text_cache_key, response)
+
+            logger.info("Analysis %s completed successfully in %dms", analysis_id, processing_time_ms)
             return response
 
         except DocumentParserError as e:
-            logger.error(f"Document parsing failed: {e}")
+            logger.error("Document parsing failed: %s", e)
             self._log_analysis(
                 analysis_id=analysis_id,
                 request=request,
                 response=None,
                 processing_time_ms=int((time.time() - start_time) * 1000),
                 status="error",
-                error_message=str(e)
+                error_message=str(e),
+                background_tasks=background_tasks
             )
             raise CVAnalyzerError(f"Failed to parse CV document: {str(e)}")
 
         except LLMProviderError as e:
-            logger.error(f"LLM provider error: {e}")
+            logger.error("LLM provider error: %s", e)
             self._log_analysis(
                 analysis_id=analysis_id,
                 request=request,
                 response=None,
                 processing_time_ms=int((time.time() - start_time) * 1000),
                 status="error",
-                error_message=str(e)
+                error_message=str(e),
+                background_tasks=background_tasks
             )
             raise CVAnalyzerError(f"LLM analysis failed: {str(e)}")
 
@@ -131,28 +262,40 @@ class CVAnalyzer:
                 response=None,
                 processing_time_ms=int((time.time() - start_time) * 1000),
                 status="error",
-                error_message=str(e)
+                error_message=str(e),
+                background_tasks=background_tasks
             )
             raise CVAnalyzerError(f"Analysis failed: {str(e)}")
 
-    def _parse_document(self, request: CVAnalysisRequest) -> tuple[str, int]:
+    def _parse_document(
+        self,
+        request: CVAnalysisRequest,
+        cv_bytes: bytes | None = None
+    ) -> tuple[str, int]:
         """
         Parse CV document and extract text
 
         Args:
             request: Analysis request
+            cv_bytes: Raw CV content, if already available
 
         Returns:
             Tuple of (extracted_text, page_count)
         """
-        logger.info(f"Parsing document: {request.cv_filename}")
+        logger.info("Parsing document: %s", request.cv_filename)
 
-        cv_text, page_count = self.document_parser.parse_base64(
-            request.cv_file,
-            request.cv_filename
-        )
+        if cv_bytes is not None:
+            cv_text, page_count = self.document_parser.parse_bytes(
+                cv_bytes,
+                request.cv_filename
+            )
+        else:
+            cv_text, page_count = self.document_parser.parse_base64(
+                request.cv_file,
+                request.cv_filename
+            )
 
-        logger.info(f"Extracted {len(cv_text)} characters from {page_count} pages")
+        logger.info("Extracted %d characters from %d pages", len(cv_text), page_count)
         return cv_text, page_count
 
     def _build_prompt(self, request: CVAnalysisRequest, cv_text: str) -> tuple[str, str]:
@@ -166,7 +309,7 @@ class CVAnalyzer:
         Returns:
             Tuple of (system_prompt, user_prompt)
         """
-        logger.info(f"Building prompt using version: {request.config.prompt_version}")
+        logger.info("Building prompt using version: %s", request.config.prompt_version)
 
         system_prompt, user_prompt = self.prompt_manager.build_analysis_prompt(
             cv_text=cv_text,
@@ -191,38 +334,33 @@ class CVAnalyzer:
             CVAnalyzerError: If parsing fails
         """
         try:
-            # Clean the content - some LLMs wrap JSON in markdown code blocks
+            # Clean the content - some LLMs wrap JSON in markdown code
+            # blocks. The precompiled regex unwraps the fence in a single
+            # scan instead of separate startswith/find/endswith passes
             cleaned_content = llm_content.strip()
-
-            # Remove markdown code block markers if present
-            if cleaned_content.startswith('```'):
-                # Find the first newline after opening ```
-                first_newline = cleaned_content.find('\n')
-                if first_newline != -1:
-                    # Remove opening ``` and language identifier
-                    cleaned_content = cleaned_content[first_newline + 1:]
-
-                # Remove closing ```
-                if cleaned_content.endswith('```'):
-                    cleaned_content = cleaned_content[:-3].rstrip()
-
-            # Try to parse as JSON
-            result = json.loads(cleaned_content)
-
-            # Validate required fields
-            required_fields = [
-                'overall_score', 'recommendation', 'section_scores',
-                'key_strengths', 'critical_gaps', 'follow_up_questions'
-            ]
-
-            for field in required_fields:
-                if field not in result:
-                    raise CVAnalyzerError(f"Missing required field in LLM response: {field}")
+            fence_match = _FENCE_RE.match(cleaned_content)
+            if fence_match:
+                cleaned_content = fence_match.group(1)
+
+            # Try to parse as JSON. orjson.JSONDecodeError subclasses
+            # json.JSONDecodeError, so the except clause covers both
+            if orjson is not None:
+                result = orjson.loads(cleaned_content)
+            else:
+                result = json.loads(cleaned_content)
+
+            # Validate required fields with one set difference, and
+            # report every missing field at once rather than the first
+            missing = _REQUIRED_FIELDS - result.keys()
+            if missing:
+                raise CVAnalyzerError(
+                    f"Missing required fields in LLM response: {', '.join(sorted(missing))}"
+                )
 
             return result
 
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response as JSON: {e}")
+            logger.error("Failed to parse LLM response as JSON: %s", e)
             logger.error(f"LLM response content (first 500 chars): {llm_content[:500]}...")
             logger.error(f"Cleaned content (first 500 chars): {cleaned_content[:500] if 'cleaned_content' in locals() else 'N/A'}...")
             raise CVAnalyzerError("LLM did not return valid JSON. Please try again.")
@@ -273,7 +411,7 @@ class CVAnalyzer:
         # Build response
         response = CVAnalysisResponse(
             analysis_id=analysis_id,
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.now(timezone.utc),
             overall_score=analysis_result['overall_score'],
             recommendation=RecommendationType(analysis_result['recommendation']),
             section_scores=section_scores,
@@ -292,7 +430,8 @@ class CVAnalyzer:
         response: CVAnalysisResponse | None,
         processing_time_ms: int,
         status: str,
-        error_message: str | None = None
+        error_message: str | None = None,
+        background_tasks: BackgroundTasks | None = None
     ):
         """
         Log analysis to audit database
@@ -304,25 +443,38 @@ class CVAnalyzer:
             processing_time_ms: Processing time
             status: Status (success/error)
             error_message: Error message if failed
+            background_tasks: When provided, the write is scheduled to run
+                after the response has been sent instead of inline
         """
+        log_kwargs = dict(
+            analysis_id=analysis_id,
+            cv_filename=request.cv_filename,
+            position_title=request.position_framework.role_title,
+            company_name=request.company_criteria.company_name,
+            llm_provider=request.config.llm_provider,
+            llm_model=response.metadata.model if response else "unknown",
+            prompt_version=request.config.prompt_version,
+            # Cache hits consumed no provider tokens this time around; the
+            # response metadata still carries the original call's count
+            tokens_used=response.metadata.tokens_used if response and status != "cached" else None,
+            processing_time_ms=processing_time_ms,
+            overall_score=response.overall_score if response else None,
+            recommendation=response.recommendation.value if response else None,
+            status=status,
+            error_message=error_message
+        )
+
+        if background_tasks is not None:
+            # Starlette runs sync background tasks in its thread pool, so
+            # the SQLite write neither delays the response nor blocks the
+            # event loop
+            background_tasks.add_task(self.audit_logger.log_analysis, **log_kwargs)
+            return
+
         try:
-            self.audit_logger.log_analysis(
-                analysis_id=analysis_id,
-                cv_filename=request.cv_filename,
-                position_title=request.position_framework.role_title,
-                company_name=request.company_criteria.company_name,
-                llm_provider=request.config.llm_provider,
-                llm_model=response.metadata.model if response else "unknown",
-                prompt_version=request.config.prompt_version,
-                tokens_used=response.metadata.tokens_used if response else None,
-                processing_time_ms=processing_time_ms,
-                overall_score=response.overall_score if response else None,
-                recommendation=response.recommendation.value if response else None,
-                status=status,
-                error_message=error_message
-            )
+            self.audit_logger.log_analysis(**log_kwargs)
         except Exception as e:
-            logger.error(f"Failed to write audit log: {e}")
+            logger.error("Failed to write audit log: %s", e)
 
 
 # Global analyzer instance
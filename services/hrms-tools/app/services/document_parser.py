@@ -5,11 +5,20 @@ Extracts text from PDF and DOC/DOCX files
 import io
 import logging
 import base64
+import zipfile
 from typing import Tuple, Optional
-import PyPDF2
-import docx
 from pathlib import Path
 
+from app.services.response_cache import ResponseCache
+
+# WordprocessingML namespace used by word/document.xml
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Parsed-text cache keyed on content hash: re-analyzing the same CV
+# (common while iterating on prompts or criteria) skips the whole
+# decode-and-extract step. Bounded LRU, so memory stays capped
+_parse_cache = ResponseCache(max_entries=128, ttl_seconds=3600)
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,21 +48,51 @@ class DocumentParser:
         try:
             # Decode base64
             file_bytes = base64.b64decode(base64_content)
-            file_stream = io.BytesIO(file_bytes)
+        except base64.binascii.Error as e:
+            logger.error(f"Base64 decode error: {e}")
+            raise DocumentParserError(f"Invalid base64 content: {str(e)}")
+
+        return DocumentParser.parse_bytes(file_bytes, filename)
+
+    @staticmethod
+    def parse_bytes(file_bytes: bytes, filename: str) -> Tuple[str, int]:
+        """
+        Parse document from raw bytes
+
+        Args:
+            file_bytes: Raw document content
+            filename: Original filename to determine type
+
+        Returns:
+            Tuple of (extracted_text, page_count)
 
+        Raises:
+            DocumentParserError: If parsing fails
+        """
+        try:
             # Determine file type from extension
             extension = Path(filename).suffix.lower()
 
+            cache_key = ResponseCache.make_key(file_bytes, extension)
+            cached = _parse_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Document served from parse cache")
+                return cached
+
+            file_stream = io.BytesIO(file_bytes)
+
             if extension == '.pdf':
-                return DocumentParser._parse_pdf(file_stream)
+                result = DocumentParser._parse_pdf(file_stream)
             elif extension in ['.doc', '.docx']:
-                return DocumentParser._parse_docx(file_stream)
+                result = DocumentParser._parse_docx(file_stream)
             else:
                 raise DocumentParserError(f"Unsupported file type: {extension}")
 
-        except base64.binascii.Error as e:
-            logger.error(f"Base64 decode error: {e}")
-            raise DocumentParserError(f"Invalid base64 content: {str(e)}")
+            _parse_cache.set(cache_key, result)
+            return result
+
+        except DocumentParserError:
+            raise
         except Exception as e:
             logger.error(f"Document parsing error: {e}")
             raise DocumentParserError(f"Failed to parse document: {str(e)}")
@@ -69,16 +108,44 @@ class DocumentParser:
         Returns:
             Tuple of (extracted_text, page_count)
         """
+        # PDF libraries are imported on first use so processes that never
+        # parse a document (health checks, cold workers) skip their
+        # import cost; sys.modules makes repeat calls a dict lookup.
+        # PyMuPDF extracts text in native code, roughly an order of
+        # magnitude faster than PyPDF2's pure-Python content-stream
+        # interpreter; environments without it fall back to PyPDF2
         try:
-            pdf_reader = PyPDF2.PdfReader(file_stream)
-            page_count = len(pdf_reader.pages)
+            import fitz  # PyMuPDF
+        except ImportError:
+            fitz = None
 
-            text_content = []
-            for page_num in range(page_count):
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                if text:
-                    text_content.append(text)
+        try:
+            if fitz is not None:
+                with fitz.open(stream=file_stream.getvalue(), filetype="pdf") as doc:
+                    page_count = doc.page_count
+                    text_content = []
+                    for page in doc:
+                        text = page.get_text("text")
+                        if text:
+                            text_content.append(text)
+            else:
+                import PyPDF2
+
+                try:
+                    pdf_reader = PyPDF2.PdfReader(file_stream)
+
+                    # Iterate pages directly: indexing pdf_reader.pages[n]
+                    # walks the page tree on every access, iteration
+                    # resolves each page once
+                    text_content = []
+                    for page in pdf_reader.pages:
+                        text = page.extract_text()
+                        if text:
+                            text_content.append(text)
+                    page_count = len(pdf_reader.pages)
+                except PyPDF2.errors.PdfReadError as e:
+                    logger.error(f"PDF read error: {e}")
+                    raise DocumentParserError(f"Invalid or corrupted PDF file: {str(e)}")
 
             full_text = "\n\n".join(text_content)
 
@@ -88,9 +155,8 @@ class DocumentParser:
             logger.info(f"Successfully extracted text from PDF ({page_count} pages, {len(full_text)} chars)")
             return full_text, page_count
 
-        except PyPDF2.errors.PdfReadError as e:
-            logger.error(f"PDF read error: {e}")
-            raise DocumentParserError(f"Invalid or corrupted PDF file: {str(e)}")
+        except DocumentParserError:
+            raise
         except Exception as e:
             logger.error(f"PDF parsing error: {e}")
             raise DocumentParserError(f"Failed to parse PDF: {str(e)}")
@@ -107,24 +173,44 @@ class DocumentParser:
             Tuple of (extracted_text, page_count)
             Note: Page count is estimated for DOCX files
         """
-        try:
-            doc = docx.Document(file_stream)
+        # Imported on first DOCX, matching the lazy PDF-library imports
+        from lxml import etree
 
-            # Extract all paragraphs
+        try:
+            # Read word/document.xml straight from the DOCX zip and walk
+            # it with lxml. python-docx builds a Python proxy object for
+            # every paragraph, run, and cell, which dominates extraction
+            # time on long CVs; the raw XML walk stays in C
+            try:
+                with zipfile.ZipFile(file_stream) as archive:
+                    document_xml = archive.read('word/document.xml')
+            except (zipfile.BadZipFile, KeyError) as e:
+                logger.error(f"DOCX format error: {e}")
+                raise DocumentParserError("Invalid DOCX file format")
+
+            body = etree.fromstring(document_xml).find(f'{_W_NS}body')
+
+            # Walk top-level paragraphs and tables in document order,
+            # matching the python-docx traversal this replaces
             text_content = []
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content.append(paragraph.text)
-
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text)
-                    if row_text:
-                        text_content.append(" | ".join(row_text))
+            for element in body if body is not None else []:
+                if element.tag == f'{_W_NS}p':
+                    text = "".join(
+                        t.text for t in element.iter(f'{_W_NS}t') if t.text
+                    )
+                    if text.strip():
+                        text_content.append(text)
+                elif element.tag == f'{_W_NS}tbl':
+                    for row in element.iter(f'{_W_NS}tr'):
+                        row_text = []
+                        for cell in row.findall(f'{_W_NS}tc'):
+                            cell_text = "".join(
+                                t.text for t in cell.iter(f'{_W_NS}t') if t.text
+                            )
+                            if cell_text.strip():
+                                row_text.append(cell_text)
+                        if row_text:
+                            text_content.append(" | ".join(row_text))
 
             full_text = "\n\n".join(text_content)
 
@@ -138,9 +224,8 @@ class DocumentParser:
             logger.info(f"Successfully extracted text from DOCX (~{estimated_pages} pages, {len(full_text)} chars)")
             return full_text, estimated_pages
 
-        except docx.opc.exceptions.PackageNotFoundError as e:
-            logger.error(f"DOCX format error: {e}")
-            raise DocumentParserError("Invalid DOCX file format")
+        except DocumentParserError:
+            raise
         except Exception as e:
             logger.error(f"DOCX parsing error: {e}")
             raise DocumentParserError(f"Failed to parse DOCX: {str(e)}")
@@ -158,9 +243,12 @@ class DocumentParser:
             True if valid, False otherwise
         """
         try:
-            # Decode to get actual file size
-            file_bytes = base64.b64decode(base64_content)
-            size_mb = len(file_bytes) / (1024 * 1024)
+            # Decoded size follows from the encoded length (4 chars per
+            # 3 bytes, minus padding), so no decode pass is needed just
+            # to check the size
+            encoded = base64_content.strip()
+            decoded_size = len(encoded) * 3 // 4 - encoded[-2:].count('=')
+            size_mb = decoded_size / (1024 * 1024)
 
             if size_mb > max_size_mb:
                 logger.warning(f"File size ({size_mb:.2f}MB) exceeds limit ({max_size_mb}MB)")
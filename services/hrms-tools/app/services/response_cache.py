@@ -0,0 +1,97 @@
+"""
+Analysis Response Cache
+Caches completed analyses so identical (CV, framework, criteria, config)
+requests skip the LLM call entirely
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Thread-safe in-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str | bytes) -> str:
+        """
+        Build a cache key by hashing each part
+
+        Args:
+            parts: Strings or bytes identifying the request (CV content,
+                   framework JSON, criteria JSON, config fields)
+
+        Returns:
+            Hex digest key
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode('utf-8')
+            digest.update(part)
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value if present and not expired
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value, evicting the least recently used entry if full
+
+        Args:
+            key: Cache key from make_key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Global cache instance
+_cache_instance: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the global response cache instance"""
+    global _cache_instance
+    if _cache_instance is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+        _cache_instance = ResponseCache(
+            max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.ANALYSIS_CACHE_TTL_SECONDS
+        )
+    return _cache_instance
@@ -0,0 +1,73 @@
+"""
+Unit tests for the run_with_deadline disconnect race
+
+A connected client must never have a healthy analysis cancelled: the
+disconnect watcher polls Request.is_disconnected() in a loop, so its
+task only completes on a real disconnect. These tests drive
+run_with_deadline directly with a Request stand-in, covering the
+non-cached path where the analysis spans several event-loop turns.
+
+No running service is needed. Run standalone:
+    python test_run_with_deadline.py
+or via pytest:
+    python -m pytest test_run_with_deadline.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Make the app package importable when run from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.api.v1.analyze import run_with_deadline  # noqa: E402
+
+
+class FakeRequest:
+    """Request stand-in exposing the polled is_disconnected() interface"""
+
+    def __init__(self, disconnected: bool = False):
+        self.disconnected = disconnected
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+def test_connected_client_gets_result():
+    """A healthy analysis on a live connection completes normally"""
+    async def analysis():
+        # Several scheduling points, like a cold LLM-backed analysis
+        await asyncio.sleep(0.05)
+        return "analysis-result"
+
+    result = asyncio.run(run_with_deadline(analysis(), FakeRequest()))
+    assert result == "analysis-result", result
+
+
+def test_disconnected_client_cancels_analysis():
+    """A gone client yields the 499 marker and cancels the in-flight work"""
+    cancelled = False
+
+    async def analysis():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return "never"
+
+    async def run():
+        response = await run_with_deadline(analysis(), FakeRequest(disconnected=True))
+        # Give the cancelled analysis task a turn to unwind
+        await asyncio.sleep(0)
+        return response
+
+    response = asyncio.run(run())
+    assert response.status_code == 499, response.status_code
+    assert cancelled
+
+
+if __name__ == "__main__":
+    test_connected_client_gets_result()
+    test_disconnected_client_cancels_analysis()
+    print("run_with_deadline tests passed")